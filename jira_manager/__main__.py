@@ -5,6 +5,7 @@ from getpass import getuser
 from jira_manager.utils import (
     create_toolbar,
     toolbar_action,
+    resume_incomplete_searches,
     create_divider,
     get_theme_mode,
     initialize_window,
@@ -19,13 +20,14 @@ from jira_manager.custom_panels import (
     switch_panel,
     ErrorMessageBuilder,
 )
-from jira_manager.sql_manager import run_sql_stmt
-from jira_manager.sql import tickets_table, fields_table
-from multiprocessing import Queue
-from threading import Event, Lock, Thread
+from jira_manager.sql_manager import get_ticket_count
+from jira_manager.migrations import migrate
+from queue import Queue
+from threading import Event, Thread
 from jira_manager.custom_widgets import TicketCard
 from os import cpu_count
 from jira_manager.file_manager import load_data
+from jira_manager.jira_client import configure_client
 
 
 def _set_cursor(event, widget, cursor):
@@ -129,8 +131,7 @@ def main():
 
     # SETUP OF DATABASE TABLES
     db_path = "jira_manager/tickets.db"
-    run_sql_stmt(db_path, tickets_table, stmt_type="create")
-    run_sql_stmt(db_path, fields_table, stmt_type="create")
+    migrate(db_path)
     stop_flag = Event()
 
     # WINDOW INIT
@@ -159,6 +160,18 @@ def main():
     internal_thread_allotment = thread_count // 2
     external_thread_allotment = thread_count - internal_thread_allotment
     print(f"Internal Thread Allotment: {internal_thread_allotment}, External Thread Allotment: {external_thread_allotment}\nTotal Thread Count: {thread_count}, cpu_count: {cpu_total}")
+
+    # Shared keep-alive pool for Jira calls, one connection per worker thread
+    proxies = None
+    if str(config.get("proxy_option", "No")).lower() == "yes":
+        proxies = {
+            "http": config.get("http_proxy"),
+            "https": config.get("https_proxy"),
+        }
+    configure_client(
+        pool_size=internal_thread_allotment + external_thread_allotment,
+        proxies=proxies,
+    )
     root.protocol("WM_DELETE_WINDOW", lambda: on_close(stop_flag, root))
 
     def clear_focus(event):
@@ -390,14 +403,15 @@ def main():
     set_button_cursors(root)
     set_combobox_cursors(root)
 
-    lock = Lock()
-    start_paging = Thread(target=panel_choice["ticket_panel"].load_page_index, args=(db_path, "SELECT ticket_id FROM tickets ORDER BY ticket_id ASC", "start", lock, stop_flag))
-    end_paging = Thread(target=panel_choice["ticket_panel"].load_page_index, args=(db_path, "SELECT ticket_id FROM tickets ORDER BY ticket_id DESC", "end", lock, stop_flag))
+    page_indexing = Thread(
+        target=panel_choice["ticket_panel"].load_page_index,
+        args=(db_path, stop_flag),
+        daemon=True,
+    )
 
 
     # SET STARTER PANEL
-    ticket_bucket = run_sql_stmt(db_path, "SELECT * FROM tickets", stmt_type="select")
-    if not ticket_bucket:
+    if not get_ticket_count(db_path):
         panel_choice["error_panel"].update_message(
             "No tickets stored in local database.\nPlease configure your Jira connection and fetch tickets."
         )
@@ -434,14 +448,13 @@ def main():
         ticket_panel.after(1500, remove_overlay)
 
 
-    start_paging.start()
-    end_paging.start()
+    page_indexing.start()
 
     def poll_page_index_threads():
-        if start_paging.is_alive() or end_paging.is_alive():
+        if page_indexing.is_alive():
             root.after(100, poll_page_index_threads)
         else:
-            print("Page index threads finished.")
+            print("Page index thread finished.")
 
     root.after(100, poll_page_index_threads)
 
@@ -456,6 +469,26 @@ def main():
 
     root.bind("<Configure>", on_configure)
 
+    # Continue searches that were cut short by a crash or shutdown
+    def resume_search(jql):
+        toolbar_action(
+            {"type": "search_jiras", "jql": jql},
+            ui_state,
+            panel_choice,
+            widget_registry,
+            theme_manager,
+            stop_flag,
+            JQL_TASK_QUEUE,
+            JQL_WORKER_RUNNING,
+            card_retainer,
+            selected_items_for_update,
+            root,
+            internal_thread_allotment,
+            db_path,
+        )
+
+    root.after(1000, lambda: resume_incomplete_searches(db_path, resume_search))
+
     root.mainloop()
 
 
@@ -0,0 +1,99 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from jira_manager.fake_jira import add_server_arguments, server_from_args
+from jira_manager.jira_client import configure_client
+from jira_manager.jql_planner import fetch_approximate_count, plan_fetch_concurrency
+from jira_manager.checkpoints import SearchCheckpoint
+from jira_manager.metadata_cache import get_metadata_cache
+from jira_manager.migrations import migrate
+from jira_manager.payload_store import get_payload_stats
+from jira_manager.sql_manager import run_sql_stmt
+from jira_manager.utils import new_shared_metadata, run_search_pipeline
+
+
+def run_ingest(server_url, db_path, jql, thread_count, editmeta_mode="shared"):
+    """
+    Runs the same fetch-and-persist path as jql_search_handler, minus the UI.
+    Returns the number of issues processed.
+    """
+    config_data = {"server": server_url}
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    approximate_count = fetch_approximate_count(config_data, jql, headers, None)
+    slice_count, worker_count = plan_fetch_concurrency(approximate_count, thread_count)
+    checkpoint = SearchCheckpoint.open(db_path, server_url, jql)
+    return run_search_pipeline(
+        config_data,
+        {"jql": jql},
+        headers,
+        None,
+        db_path,
+        [],
+        [],
+        [],
+        worker_count=worker_count,
+        slice_count=slice_count,
+        expand_editmeta=editmeta_mode == "expand",
+        shared_metadata=new_shared_metadata(get_metadata_cache(db_path)),
+        checkpoint=checkpoint,
+        known_keys=set(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark ticket ingest against a local fake Jira server."
+    )
+    add_server_arguments(parser)
+    parser.add_argument("--threads", type=int, default=8, help="Fetch/persist thread count")
+    parser.add_argument("--jql", default="project = BENCH ORDER BY key")
+    parser.add_argument("--editmeta-mode", choices=("shared", "expand"), default="shared")
+    parser.add_argument("--db", help="Database file to ingest into (default: a temporary one)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the ingest log output")
+    args = parser.parse_args()
+
+    temp_dir = None
+    db_path = args.db
+    if not db_path:
+        temp_dir = tempfile.mkdtemp(prefix="jira_bench_")
+        db_path = os.path.join(temp_dir, "tickets.db")
+    migrate(db_path)
+
+    client = configure_client(pool_size=args.threads)
+    try:
+        with server_from_args(args) as server:
+            print(f"Fake Jira serving {args.issues} issues at {server.url}")
+            start = time.perf_counter()
+            try:
+                if args.verbose:
+                    processed = run_ingest(server.url, db_path, args.jql, args.threads, args.editmeta_mode)
+                else:
+                    # The ingest path logs every ticket, which would swamp the report
+                    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                        processed = run_ingest(server.url, db_path, args.jql, args.threads, args.editmeta_mode)
+            except Exception as e:
+                # 500s are not retried, so a high --error-rate can abort the search
+                print(f"Ingest failed after {time.perf_counter() - start:.2f}s: {e}")
+                return
+            elapsed = time.perf_counter() - start
+            stats = client.get_stats()
+            stored = run_sql_stmt(db_path, "SELECT COUNT(*) FROM tickets", stmt_type="select")[0][0]
+
+            print(f"Processed {processed} tickets ({stored} stored) in {elapsed:.2f}s")
+            print(f"  tickets/sec:  {processed / elapsed:.1f}")
+            print(f"  requests/sec: {stats['requests'] / elapsed:.1f} ({stats['requests']} requests, {stats['retries']} retries, {stats['errors']} errors)")
+            print(f"  latency p50:  {stats['p50_latency'] * 1000:.1f} ms")
+            print(f"  latency p99:  {stats['p99_latency'] * 1000:.1f} ms")
+            print(f"  server calls: {server.stats}")
+            print(f"  payloads:     {get_payload_stats(db_path)}")
+    finally:
+        client.close()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
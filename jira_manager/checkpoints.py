@@ -0,0 +1,151 @@
+import datetime
+import uuid
+from threading import Lock
+from jira_manager.sql_manager import run_sql_stmt
+
+
+def now_iso():
+    return datetime.datetime.now().isoformat()
+
+
+def get_incomplete_search_tasks(db_path):
+    rows = run_sql_stmt(
+        db_path,
+        "SELECT task_id, server, jql FROM search_tasks WHERE status = 'running' ORDER BY created_at",
+        stmt_type="select",
+    )
+    return [{"task_id": row[0], "server": row[1], "jql": row[2]} for row in rows or []]
+
+
+class SearchCheckpoint:
+    """
+    Progress of one jql_search task persisted in tickets.db, so a restarted
+    worker continues each slice from its last committed nextPageToken.
+
+    Pages of a slice may be committed out of order by parallel workers, so a
+    slice's checkpoint only advances over the contiguous committed prefix.
+    """
+
+    def __init__(self, db_path, task_id, server, jql, slices=None):
+        self.db_path = db_path
+        self.task_id = task_id
+        self.server = server
+        self.jql = jql
+        # slice_index -> {"jql", "token", "pages", "status"}
+        self.slices = slices or {}
+        self._pending = {}
+        self._lock = Lock()
+
+    @classmethod
+    def open(cls, db_path, server, jql):
+        """
+        Returns the unfinished checkpoint for this server and JQL, or a new one.
+        """
+        rows = run_sql_stmt(
+            db_path,
+            "SELECT task_id FROM search_tasks WHERE server = ? AND jql = ? AND status = 'running' ORDER BY created_at DESC LIMIT 1",
+            stmt_type="select",
+            params=(server, jql),
+        )
+        if rows:
+            task_id = rows[0][0]
+            slice_rows = run_sql_stmt(
+                db_path,
+                "SELECT slice_index, slice_jql, next_page_token, pages_committed, status FROM search_checkpoints WHERE task_id = ?",
+                stmt_type="select",
+                params=(task_id,),
+            )
+            slices = {
+                row[0]: {"jql": row[1], "token": row[2], "pages": row[3], "status": row[4]}
+                for row in slice_rows or []
+            }
+            print(f"Resuming search task {task_id} with {len(slices)} slice(s)")
+            return cls(db_path, task_id, server, jql, slices)
+
+        task_id = uuid.uuid4().hex
+        stamp = now_iso()
+        run_sql_stmt(
+            db_path,
+            "INSERT INTO search_tasks (task_id, server, jql, status, created_at, updated_at) VALUES (?, ?, ?, 'running', ?, ?)",
+            stmt_type="insert",
+            params=(task_id, server, jql, stamp, stamp),
+        )
+        return cls(db_path, task_id, server, jql)
+
+    def is_resumed(self):
+        return bool(self.slices)
+
+    def set_slices(self, slice_jqls):
+        stamp = now_iso()
+        with self._lock:
+            for index, slice_jql in enumerate(slice_jqls):
+                self.slices[index] = {"jql": slice_jql, "token": None, "pages": 0, "status": "running"}
+                run_sql_stmt(
+                    self.db_path,
+                    "INSERT OR REPLACE INTO search_checkpoints (task_id, slice_index, slice_jql, next_page_token, pages_committed, status, updated_at) VALUES (?, ?, ?, NULL, 0, 'running', ?)",
+                    stmt_type="insert",
+                    params=(self.task_id, index, slice_jql, stamp),
+                )
+
+    def pending_slices(self):
+        """
+        Returns [(slice_index, slice_jql, resume_token, pages_committed)] still to fetch.
+        """
+        with self._lock:
+            return [
+                (index, info["jql"], info["token"], info["pages"])
+                for index, info in sorted(self.slices.items())
+                if info["status"] != "complete"
+            ]
+
+    def restart_slice(self, slice_index):
+        # Used when Jira no longer accepts a saved nextPageToken
+        with self._lock:
+            self._pending.pop(slice_index, None)
+        self._save_slice(slice_index, None, 0, "running")
+
+    def page_committed(self, slice_index, page_number, next_page_token):
+        """
+        Records that page_number of a slice is stored in the database.
+        next_page_token is the token that fetches the page after it.
+        """
+        with self._lock:
+            pending = self._pending.setdefault(slice_index, {})
+            pending[page_number] = next_page_token
+            info = self.slices[slice_index]
+            advanced = False
+            while info["pages"] in pending:
+                info["token"] = pending.pop(info["pages"])
+                info["pages"] += 1
+                advanced = True
+            if not advanced:
+                return
+            if info["token"] is None:
+                info["status"] = "complete"
+            token, pages, status = info["token"], info["pages"], info["status"]
+        self._save_slice(slice_index, token, pages, status)
+
+    def _save_slice(self, slice_index, token, pages, status):
+        with self._lock:
+            info = self.slices[slice_index]
+            info.update({"token": token, "pages": pages, "status": status})
+        run_sql_stmt(
+            self.db_path,
+            "UPDATE search_checkpoints SET next_page_token = ?, pages_committed = ?, status = ?, updated_at = ? WHERE task_id = ? AND slice_index = ?",
+            stmt_type="update",
+            params=(token, pages, status, now_iso(), self.task_id, slice_index),
+        )
+
+    def complete(self):
+        run_sql_stmt(
+            self.db_path,
+            "UPDATE search_tasks SET status = 'complete', updated_at = ? WHERE task_id = ?",
+            stmt_type="update",
+            params=(now_iso(), self.task_id),
+        )
+        run_sql_stmt(
+            self.db_path,
+            "DELETE FROM search_checkpoints WHERE task_id = ?",
+            stmt_type="delete",
+            params=(self.task_id,),
+        )
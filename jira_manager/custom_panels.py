@@ -3,7 +3,20 @@ from tkinter import ttk
 from jira_manager.themes import ThemeManager
 from jira_manager.file_manager import load_data, save_data
 from jira_manager.custom_widgets import EntryWithPlaceholder, TicketCard
-from jira_manager.sql_manager import run_sql_stmt
+from jira_manager.sql_manager import (
+    run_sql_stmt,
+    TICKET_CARD_COLUMNS,
+    ticket_card_data,
+    load_ticket_cards,
+    get_ticket_count,
+)
+from jira_manager.local_search import (
+    SEARCH_PAGE_SIZE,
+    build_match_query,
+    count_search_results,
+    search_tickets,
+)
+from jira_manager.page_index import PAGE_SIZE, load_page_bounds, get_rank_index
 from math import ceil
 import sys
 import os
@@ -149,13 +162,15 @@ def switch_panel(
 
     if panel_key == "ticket_panel":
         if db_path:
+            # The full list is reloaded below, so local search results are dropped
+            panel_choice["ticket_panel"].leave_search_mode()
             current_page = panel_choice["ticket_panel"].current_page
             
             try:
                 # Initial load: get the first 50 tickets, newest first
                 issues = run_sql_stmt(
                     db_path,
-                    "SELECT * FROM tickets ORDER BY ticket_id DESC LIMIT 50;",
+                    f"SELECT {TICKET_CARD_COLUMNS} FROM tickets ORDER BY ticket_id DESC LIMIT 50;",
                     stmt_type="select"
                 )
                 for issue in issues:
@@ -170,14 +185,14 @@ def switch_panel(
                 else:
                     last_id = None
                 print(f"{len(issues)=} from panel switch")
-                total_tickets = run_sql_stmt(db_path, "SELECT COUNT(*) FROM tickets", stmt_type="select")
-                print(f"{total_tickets[0][0]=}")
+                total_tickets = get_ticket_count(db_path)
+                print(f"{total_tickets=}")
                 show_issues = []
                 for i, issue in enumerate(issues):
-                    show = {"key": issue[1]}
+                    show = ticket_card_data(issue)
                     if i < 50 and show not in show_issues:
                         show_issues.append(show)
-                total_pages = ceil(total_tickets[0][0] / 50)
+                total_pages = ceil(total_tickets / 50)
                 panel_choice["ticket_panel"].widget_registry.get(
                     "total_tickets"
                 ).config(text=f"{total_pages}")
@@ -358,7 +373,9 @@ class ConfigurationFormBuilder(tk.Frame):
             # Get previous thread count from config
             prev_thread_count = self.config.get("thread_count", "safe_mode")
 
-            payload = {
+            # Keep settings that have no form input (e.g. editmeta_mode)
+            payload = load_data()
+            payload.update({
                 "server": get_clean_value(jira_server_input),
                 "http_proxy": http_input.get(),
                 "https_proxy": https_input.get(),
@@ -368,7 +385,7 @@ class ConfigurationFormBuilder(tk.Frame):
                 "auth_type": selected_auth.get(),
                 "proxy_option": proxy_option.get(),
                 "theme": theme_option.get(),
-            }
+            })
             tc_display = thread_count_option.get()
             tc_value = display_to_value.get(tc_display, tc_display)
             payload["thread_count"] = tc_value
@@ -943,51 +960,33 @@ class TicketDisplayBuilder(tk.Frame):
         self.last_ticket_id = None
         self.first_ticket_id = None
         self.page_index = {}
+        # Local search state, search_cursors[n] is the keyset cursor page n + 1 starts after
+        self.search_query = None
+        self.search_cursors = []
+        # Rows of a JQL query answered from the local database
+        self.local_results = None
+        self.saved_total_pages = None
+        self._search_after_id = None
 
         # Build UI immediately or delay via external trigger
         self._build_ticket_board()
 
 
-    def load_page_index(self, db_path, sql, pull_type, lock, stop_flag=None):
+    def load_page_index(self, db_path, stop_flag=None):
+        """
+        Fills page_index from the persisted page_blocks, rebuilding only the
+        pages changed since they were stored.
+        """
         try:
-            existed_count = 0
-            issues = run_sql_stmt(
-                db_path,
-                sql,
-                stmt_type="select",
-            )
-            total_pages = max(1, ceil(len(issues) / 50))
-            if pull_type == "start":
-                pages = range(1, total_pages + 1)  # 1 to total_pages inclusive
-            elif pull_type == "end":
-                pages = range(total_pages, 0, -1)  # total_pages down to 1 inclusive
-            else:
+            bounds = load_page_bounds(db_path)
+            if stop_flag is not None and stop_flag.is_set():
+                print("Page index thread received stop signal, exiting early.")
                 return
-            if issues:
-                for page in pages:
-                    if stop_flag is not None and stop_flag.is_set():
-                        print("Page index thread received stop signal, exiting early.")
-                        break
-                    start_idx = (page - 1) * 50
-                    end_idx = start_idx + 50
-                    page_issues = issues[start_idx:end_idx]
-                    if not page_issues:
-                        continue
-                    with lock:
-                        first_id = page_issues[0][0]
-                        last_id = page_issues[-1][0]
-                        if self.check_page_index(page) == False and self.check_page_cursors(page, (first_id, last_id)) == False:
-                            self.update_first_ticket_id(first_id)
-                            self.update_last_ticket_id(last_id)
-                            self.update_page_index(page, (first_id, last_id))
-                            print(f"Loaded page {page} index: {first_id} to {last_id}")
-                            if existed_count > 0:
-                                existed_count -= 1
-                        else:
-                            existed_count += 1
-                        if existed_count >= 5:
-                            break
-            print("Page index thread finished normally.")
+            for page, cursors in bounds.items():
+                self.update_page_index(page, cursors)
+            print(f"Page index loaded with {len(bounds)} pages.")
+            # Kept current on every jump, unlike the page_index snapshot
+            get_rank_index(db_path).build()
         except Exception as e:
             import traceback
             print("Exception in load_page_index:", e)
@@ -1031,7 +1030,7 @@ class TicketDisplayBuilder(tk.Frame):
 
             canvas.bind("<MouseWheel>", _on_mousewheel)
 
-    def set_page_contents(self, pg_num: int, selected_items, db_path, sql, params=None, pre_fetched_issues=None):
+    def set_page_contents(self, pg_num: int, selected_items, db_path, sql, params=None, pre_fetched_issues=None, record_index=True):
         # db_path = self.panel_choice["db_path"]
         # tickets_per_page = 50
         # # Get total ticket count
@@ -1069,7 +1068,8 @@ class TicketDisplayBuilder(tk.Frame):
         if issues:
             last_id = issues[-1][0]
             first_id = issues[0][0]
-            if self.check_page_index(pg_num) == False:
+            # Search result pages must not overwrite the ticket_id page index
+            if record_index and self.check_page_index(pg_num) == False:
                 self.update_last_ticket_id(last_id)
                 self.update_first_ticket_id(first_id)
                 print(f"{first_id=}, {last_id=}")
@@ -1084,9 +1084,7 @@ class TicketDisplayBuilder(tk.Frame):
         # Adjust this as needed for your TicketCard
         tickets_to_show = []
         for issue in issues:
-            # Example: id at index 0, key at index 1
-            ticket = {"id": issue[0], "key": issue[1]}
-            tickets_to_show.append(ticket)
+            tickets_to_show.append(ticket_card_data(issue))
         print(f"{tickets_to_show=}")
 
         # if self.panel_choice is not None:
@@ -1184,6 +1182,216 @@ class TicketDisplayBuilder(tk.Frame):
         canvas = self.widget_registry.get("canvas")
         canvas.yview_moveto(0)
 
+    def go_to_key(self, key):
+        """
+        Shows the board page holding key and scrolls its card into view.
+        Returns False when the key isn't stored.
+        """
+        db_path = self.panel_choice.get("db_path")
+        key = key.strip().upper()
+        rows = run_sql_stmt(
+            db_path, "SELECT ticket_id FROM tickets WHERE key = ?", stmt_type="select", params=(key,)
+        )
+        if not rows:
+            print(f"Ticket {key} is not stored locally.")
+            return False
+        ticket_id = rows[0][0]
+        self.leave_search_mode()
+
+        rank_index = get_rank_index(db_path)
+        if rank_index.ready:
+            if rank_index.sync():
+                self.page_index.clear()
+            position = rank_index.position_of(ticket_id)
+            page_start = rank_index.page_start((position - 1) // PAGE_SIZE + 1)
+        else:
+            # Until the rank index is built, count with the primary key instead
+            position = run_sql_stmt(
+                db_path,
+                "SELECT COUNT(*) + 1 FROM tickets WHERE ticket_id > ?",
+                stmt_type="select",
+                params=(ticket_id,),
+            )[0][0]
+            page_start = run_sql_stmt(
+                db_path,
+                "SELECT ticket_id FROM tickets WHERE ticket_id >= ? ORDER BY ticket_id ASC LIMIT 1 OFFSET ?",
+                stmt_type="select",
+                params=(ticket_id, (position - 1) % PAGE_SIZE),
+            )[0][0]
+        page = (position - 1) // PAGE_SIZE + 1
+        self.update_total_pages(max(1, ceil(get_ticket_count(db_path) / PAGE_SIZE)))
+        sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id <= ? ORDER BY ticket_id DESC LIMIT 50;"
+        self.set_page_contents(page, self.selected_items, db_path, sql, (page_start,))
+        self.update_page_number(page)
+        self.update_nav_buttons(page)
+        self.widget_registry["current_pg"].config(text=str(page))
+        self.widget_registry["total_tickets"].config(text=str(self.total_pages))
+        self.scroll_to_card(key)
+        return True
+
+    def refresh_page(self, removed_keys=()):
+        """
+        Redraws only the visible page after tickets were deleted, keeping the
+        page number unless the board got shorter.
+        """
+        db_path = self.panel_choice.get("db_path")
+        if removed_keys and isinstance(self.tickets, list):
+            removed = set(removed_keys)
+            self.tickets = [t for t in self.tickets if t.get("key") not in removed]
+        if self.search_query is not None:
+            # Deleted tickets drop out of the search index by trigger
+            self.show_search_page(self.current_page)
+            return
+        rank_index = get_rank_index(db_path)
+        if rank_index.ready:
+            rank_index.sync()
+        self.page_index.clear()
+        total = get_ticket_count(db_path)
+        self.update_total_pages(max(1, ceil(total / PAGE_SIZE)))
+        page = min(self.current_page, self.total_pages)
+        if total == 0:
+            self.show_no_search_results("No tickets stored in local database.")
+        elif page == 1:
+            sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets ORDER BY ticket_id DESC LIMIT 50;"
+            self.set_page_contents(page, self.selected_items, db_path, sql)
+        else:
+            # Without the rank index, the rest of the page moves up under the
+            # current first ticket
+            page_start = rank_index.page_start(page) if rank_index.ready else None
+            sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id <= ? ORDER BY ticket_id DESC LIMIT 50;"
+            self.set_page_contents(page, self.selected_items, db_path, sql, (page_start or self.first_ticket_id,))
+        self.update_page_number(page)
+        self.update_nav_buttons(page)
+        self.widget_registry["current_pg"].config(text=str(page))
+        self.widget_registry["total_tickets"].config(text=str(self.total_pages))
+
+    def scroll_to_card(self, key):
+        canvas = self.widget_registry.get("canvas")
+        base_frame = self.widget_registry.get("base_frame")
+        base_frame.update_idletasks()
+        canvas.configure(scrollregion=canvas.bbox("all"))
+        height = base_frame.winfo_height()
+        for child in base_frame.winfo_children():
+            if isinstance(child, TicketCard) and child.ticket_key == key:
+                canvas.yview_moveto(child.winfo_y() / height if height else 0)
+                child.focus_set()
+                break
+
+    def run_local_search(self, text):
+        """
+        Shows tickets from the local database matching text, best match first.
+        Empty text returns to the full ticket list.
+        """
+        if self.panel_choice is None:
+            return
+        if build_match_query(text) is None:
+            self.clear_local_search()
+            return
+        db_path = self.panel_choice.get("db_path")
+        if self.search_query is None:
+            self.saved_total_pages = self.total_pages
+        self.search_query = text
+        self.search_cursors = [None]
+        self.local_results = None
+        self.show_local_badge(False)
+        total = count_search_results(db_path, text)
+        self.update_total_pages(max(1, ceil(total / SEARCH_PAGE_SIZE)))
+        self.show_search_page(1)
+
+    def show_local_results(self, rows, jql):
+        """
+        Shows the (ticket_id, key) rows of a JQL query answered locally.
+        """
+        if self.search_query is None:
+            self.saved_total_pages = self.total_pages
+        self.search_query = jql
+        self.search_cursors = []
+        self.local_results = list(rows)
+        self.update_total_pages(max(1, ceil(len(self.local_results) / SEARCH_PAGE_SIZE)))
+        self.show_local_badge(True)
+        self.show_search_page(1)
+
+    def show_local_badge(self, visible):
+        badge = self.widget_registry.get("local_badge")
+        if badge is None:
+            return
+        if visible and not badge.winfo_ismapped():
+            badge.pack(side="left", padx=(10, 0))
+        elif not visible:
+            badge.pack_forget()
+
+    def show_search_page(self, page):
+        db_path = self.panel_choice.get("db_path")
+        page = max(1, min(page, self.total_pages))
+        if self.local_results is not None:
+            start = (page - 1) * SEARCH_PAGE_SIZE
+            rows = self.local_results[start : start + SEARCH_PAGE_SIZE]
+        else:
+            # Walk the keyset cursors forward when jumping past the known pages
+            while len(self.search_cursors) <= page:
+                rows = search_tickets(db_path, self.search_query, self.search_cursors[-1])
+                if not rows:
+                    break
+                self.search_cursors.append((rows[-1][2], rows[-1][0]))
+            rows = search_tickets(db_path, self.search_query, self.search_cursors[min(page, len(self.search_cursors)) - 1])
+        if rows:
+            # Search rows only carry ids, the card columns come in one lookup
+            rows = load_ticket_cards(db_path, [row[0] for row in rows])
+            self.set_page_contents(page, self.selected_items, db_path, None, None, rows, record_index=False)
+        else:
+            self.show_no_search_results()
+        self.update_page_number(page)
+        self.widget_registry["current_pg"].config(text=str(page))
+        self.widget_registry["total_tickets"].config(text=str(self.total_pages))
+        self.update_nav_buttons(page)
+        self.scroll_to_top()
+
+    def show_no_search_results(self, message="No local tickets match this search."):
+        base_frame = self.widget_registry.get("base_frame")
+        for child in base_frame.winfo_children():
+            if getattr(child, "is_loadbar_frame", False):
+                continue
+            child.destroy()
+        label = tk.Label(
+            base_frame,
+            text=message,
+            font=("Trebuchet MS", 12),
+        )
+        label.pack(side="top", pady=20)
+        self.theme_manager.register(label, "label")
+
+    def leave_search_mode(self):
+        """
+        Drops local search state without redrawing, for callers that load
+        the ticket list themselves. Returns False if no search was shown.
+        """
+        if self.search_query is None:
+            return False
+        self.search_query = None
+        self.search_cursors = []
+        self.local_results = None
+        self.show_local_badge(False)
+        search_entry = self.widget_registry.get("search_entry")
+        if search_entry is not None and search_entry.get_user_input():
+            search_entry.reset_to_placeholder()
+        self.update_total_pages(self.saved_total_pages or 1)
+        return True
+
+    def clear_local_search(self):
+        if not self.leave_search_mode():
+            return
+        db_path = self.panel_choice.get("db_path")
+        sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets ORDER BY ticket_id DESC LIMIT 50;"
+        self.set_page_contents(1, self.selected_items, db_path, sql)
+        if 1 in self.page_index:
+            first_id, last_id = self.page_index[1]
+            self.update_first_ticket_id(first_id)
+            self.update_last_ticket_id(last_id)
+        self.update_page_number(1)
+        self.widget_registry["current_pg"].config(text="1")
+        self.update_nav_buttons(1)
+        self.scroll_to_top()
+
     def update_return_top_btn(self):
         # Get current page and ticket range
         tickets_per_page = 50
@@ -1276,6 +1484,9 @@ class TicketDisplayBuilder(tk.Frame):
 
     #     self.widget_registry.get("prev_btn").after(100, enable_buttons)
     def prev_action(self):
+        if self.search_query is not None:
+            self.show_search_page(self.current_page - 1)
+            return
         prev_btn = self.widget_registry.get("prev_btn")
         nxt_btn = self.widget_registry.get("nxt_btn")
         if prev_btn:
@@ -1286,12 +1497,12 @@ class TicketDisplayBuilder(tk.Frame):
         db_path = self.panel_choice.get("db_path")
         new_pg = max(1, current_page - 1)
         if current_page == 1:
-            sql = "SELECT * FROM tickets ORDER BY ticket_id DESC LIMIT 50;"
+            sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets ORDER BY ticket_id DESC LIMIT 50;"
             self.set_page_contents(1, self.selected_items, db_path, sql)
         else:
             # Strict keyset paging: use first_id as cursor, ASC, then reverse
             first_id = self.first_ticket_id
-            sql = "SELECT * FROM tickets WHERE ticket_id > ? ORDER BY ticket_id ASC LIMIT 50;"
+            sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id > ? ORDER BY ticket_id ASC LIMIT 50;"
             issues = run_sql_stmt(db_path, sql, stmt_type="select", params=(first_id,))
             issues = list(reversed(issues))
             self.set_page_contents(new_pg, self.selected_items, db_path, None, None, issues)
@@ -1331,6 +1542,9 @@ class TicketDisplayBuilder(tk.Frame):
     #     self.widget_registry.get("nxt_btn").after(100, enable_buttons)
 
     def nxt_action(self):
+        if self.search_query is not None:
+            self.show_search_page(self.current_page + 1)
+            return
         prev_btn = self.widget_registry.get("prev_btn")
         nxt_btn = self.widget_registry.get("nxt_btn")
         if prev_btn:
@@ -1343,7 +1557,7 @@ class TicketDisplayBuilder(tk.Frame):
         new_pg = min(last_page, current_page + 1)
         # Strict keyset paging: use last_id as cursor, DESC
         last_id = self.last_ticket_id
-        sql = "SELECT * FROM tickets WHERE ticket_id < ? ORDER BY ticket_id DESC LIMIT 50;"
+        sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id < ? ORDER BY ticket_id DESC LIMIT 50;"
         self.set_page_contents(new_pg, self.selected_items, db_path, sql, (last_id,))
         self.update_page_number(new_pg)
         def enable_buttons():
@@ -1450,12 +1664,25 @@ class TicketDisplayBuilder(tk.Frame):
             last_page = self.total_pages
             db_path = self.panel_choice.get("db_path")
             page = max(1, min(page, last_page))
+            if self.search_query is not None:
+                self.show_search_page(page)
+                return
+            rank_index = get_rank_index(db_path)
+            if rank_index.ready and rank_index.sync():
+                # Tickets were added or deleted, cached cursors may have shifted
+                self.page_index.clear()
+                self.update_total_pages(max(1, ceil(rank_index.total / PAGE_SIZE)))
+                self.widget_registry["total_tickets"].config(text=str(self.total_pages))
+                page = max(1, min(page, self.total_pages))
             if page == 1:
-                sql = "SELECT * FROM tickets ORDER BY ticket_id DESC LIMIT 50;"
+                sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets ORDER BY ticket_id DESC LIMIT 50;"
                 self.set_page_contents(page, self.selected_items, db_path, sql)
+            elif rank_index.ready and rank_index.page_start(page) is not None:
+                sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id <= ? ORDER BY ticket_id DESC LIMIT 50;"
+                self.set_page_contents(page, self.selected_items, db_path, sql, (rank_index.page_start(page),))
             elif (page - 1) in self.page_index:
                 _, prev_last_id = self.page_index[page - 1]
-                sql = "SELECT * FROM tickets WHERE ticket_id < ? ORDER BY ticket_id DESC LIMIT 50;"
+                sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id < ? ORDER BY ticket_id DESC LIMIT 50;"
                 self.set_page_contents(page, self.selected_items, db_path, sql, (prev_last_id,))
             else:
                 show_internal = self.widget_registry.get("show_internal_loadbar")
@@ -1470,7 +1697,7 @@ class TicketDisplayBuilder(tk.Frame):
                     if internal_loadbar_label:
                         internal_loadbar_label.config(text="1/1")
                 offset = (page - 1) * 50
-                sql = f"SELECT * FROM tickets ORDER BY ticket_id DESC LIMIT 50 OFFSET {offset};"
+                sql = f"SELECT {TICKET_CARD_COLUMNS} FROM tickets ORDER BY ticket_id DESC LIMIT 50 OFFSET {offset};"
                 self.set_page_contents(page, self.selected_items, db_path, sql)
                 if hide_internal:
                     self.after(200, hide_internal)
@@ -1489,6 +1716,25 @@ class TicketDisplayBuilder(tk.Frame):
         go_btn.pack(side="left", padx=(0, 5))
         self.theme_manager.register(go_btn, "base_button")
 
+        key_jump_entry = EntryWithPlaceholder(
+            page_jump_frame,
+            placeholder="go to key",
+            font=("Trebuchet MS", 12),
+            initial_text="",
+            width=12,
+        )
+        key_jump_entry.pack(side="left", padx=(10, 5))
+        self.theme_manager.register(key_jump_entry, "placeholder_entry")
+
+        def handle_key_jump_event(event=None):
+            key = key_jump_entry.get_user_input()
+            if key.strip():
+                self.go_to_key(key)
+            key_jump_entry.reset_to_placeholder()
+            self.focus_set()
+
+        key_jump_entry.bind("<Return>", handle_key_jump_event)
+
         def toggle_page_jump():
             if page_jump_frame.winfo_ismapped():
                 page_jump_frame.pack_forget()
@@ -1507,6 +1753,55 @@ class TicketDisplayBuilder(tk.Frame):
         dropdown_btn.pack(side="left", padx=(20, 0))
         self.theme_manager.register(dropdown_btn, "base_button")
 
+        # Local full-text search over the tickets already in the database
+        search_entry = EntryWithPlaceholder(
+            tool_bar,
+            placeholder="search local tickets",
+            font=("Trebuchet MS", 12),
+            initial_text="",
+            width=24,
+        )
+        search_entry.pack(side="left", padx=(20, 5))
+        self.theme_manager.register(search_entry, "placeholder_entry")
+        self.widget_registry["search_entry"] = search_entry
+
+        def schedule_search(event=None):
+            # Debounce typing so each keystroke doesn't re-render the board
+            if self._search_after_id is not None:
+                self.after_cancel(self._search_after_id)
+            self._search_after_id = self.after(
+                250, lambda: self.run_local_search(search_entry.get_user_input())
+            )
+
+        def clear_search():
+            search_entry.reset_to_placeholder()
+            self.focus_set()
+            self.clear_local_search()
+
+        search_entry.bind("<KeyRelease>", schedule_search)
+        search_entry.bind("<Return>", schedule_search)
+        search_entry.bind("<Escape>", lambda event: clear_search())
+
+        clear_search_btn = tk.Button(
+            tool_bar,
+            text="✕",
+            command=clear_search,
+            font=("Segoe UI", 11),
+            cursor="hand2",
+        )
+        clear_search_btn.pack(side="left")
+        self.theme_manager.register(clear_search_btn, "base_button")
+
+        # Shown while the board holds JQL results answered from the local database
+        local_badge = tk.Label(
+            tool_bar,
+            text="local",
+            font=("Trebuchet MS", 10, "bold"),
+            padx=6,
+        )
+        self.theme_manager.register(local_badge, "label")
+        self.widget_registry["local_badge"] = local_badge
+
         canvas = tk.Canvas(self)
         canvas.pack(fill="both", expand=True, side="left")
         self.theme_manager.register(canvas, "frame")
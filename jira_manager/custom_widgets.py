@@ -94,7 +94,8 @@ class WorkReceiptsPanel(tk.Frame):
 
 
 import tkinter as tk
-from jira_manager.sql_manager import run_sql_stmt
+from jira_manager.sql_manager import delete_tickets
+from jira_manager.page_index import get_rank_index
 
 
 class EntryWithPlaceholder(tk.Entry):
@@ -271,16 +272,35 @@ class TicketCard(tk.Frame):
         title.pack(anchor="w")
         self.theme_manager.register(title, "label")
 
-        if len(ticket_data) > 2:
-            descript = tk.Label(
+        if ticket_data.get("summary"):
+            summary = tk.Label(
                 info,
-                text=ticket_data["fields"]["description"],
+                text=ticket_data["summary"],
                 font=("Segoe UI", 10),
                 wraplength=400,
                 justify="left",
             )
-            descript.pack(anchor="w")
-            self.theme_manager.register(descript, "label")
+            summary.pack(anchor="w")
+            self.theme_manager.register(summary, "label")
+
+        # e.g. "In Progress · High · Jane Doe · updated 2024-05-01 09:30"
+        details = [
+            ticket_data.get("status"),
+            ticket_data.get("priority"),
+            ticket_data.get("assignee") or ("Unassigned" if ticket_data.get("status") else None),
+        ]
+        if ticket_data.get("updated"):
+            details.append(f"updated {ticket_data['updated'][:16].replace('T', ' ')}")
+        details = [detail for detail in details if detail]
+        if details:
+            meta = tk.Label(
+                info,
+                text="  \u00b7  ".join(details),
+                font=("Segoe UI", 9),
+                justify="left",
+            )
+            meta.pack(anchor="w")
+            self.theme_manager.register(meta, "label")
 
         delete_btn = tk.Button(
             actions,
@@ -384,29 +404,9 @@ class TicketCard(tk.Frame):
         self.update_toolbar_buttons()
 
     def delete(self, _):
-        # Get ticket_id for this key
-        ticket_row = run_sql_stmt(
-            self.db_path,
-            "SELECT ticket_id FROM tickets WHERE key = ?",
-            params=(self.ticket_key,),
-            stmt_type="select",
-        )
-        ticket_id = ticket_row[0][0] if ticket_row else None
-        # Delete from tickets (fields will be deleted by cascade if PRAGMA is on)
-        run_sql_stmt(
-            self.db_path,
-            "DELETE FROM tickets WHERE key = ?",
-            params=(self.ticket_key,),
-            stmt_type="delete",
-        )
-        # Explicitly delete from fields as fallback (in case PRAGMA is off)
-        if ticket_id is not None:
-            run_sql_stmt(
-                self.db_path,
-                "DELETE FROM fields WHERE ticket_id = ?",
-                params=(ticket_id,),
-                stmt_type="delete",
-            )
+        # Fields, payload and search rows are removed with the ticket
+        deleted = delete_tickets(self.db_path, [self.ticket_key])
+        get_rank_index(self.db_path).remove(deleted.values())
         # Remove from selected_items if present
         if self.selected_items and self.ticket_key in self.selected_items:
             self.selected_items.remove(self.ticket_key)
@@ -417,26 +417,11 @@ class TicketCard(tk.Frame):
                 t for t in self.card_retainer if t.get("key") != self.ticket_key
             ]
         self.destroy()  # Remove the widget from the UI
-        # Robust refresh: reload tickets, sync card_retainer, and update UI
         if self.panel_choice and "ticket_panel" in self.panel_choice:
-            ticket_panel = self.panel_choice["ticket_panel"]
-            db_path = self.db_path
-            issues = run_sql_stmt(
-                db_path,
-                "SELECT * FROM tickets ORDER BY CAST(SUBSTR(key, INSTR(key, '-') + 1) AS INTEGER) DESC;",
-                stmt_type="select",
-            )
-            ticket_panel.tickets = [{"key": issue[1]} for issue in issues]
-            valid_keys = set([t["key"] for t in ticket_panel.tickets])
             card_retainer = self.panel_choice.get("card_retainer")
             if card_retainer is not None:
-                card_retainer[:] = [t for t in card_retainer if t.get("key") in valid_keys]
-            if "current_pg" in ticket_panel.widget_registry:
-                pg_num = int(ticket_panel.widget_registry["current_pg"].cget("text"))
-            else:
-                pg_num = 1
-            ticket_panel.set_page_contents(pg_num, self.selected_items)
-
+                card_retainer[:] = [t for t in card_retainer if t.get("key") != self.ticket_key]
+            self.panel_choice["ticket_panel"].refresh_page([self.ticket_key])
 
     def _bind_all_children(self, widget, callback):
         # Avoid binding click event to buttons
@@ -665,56 +650,33 @@ class TicketCard(tk.Frame):
         def do_delete():
             cleanup_popup()
             popup.destroy()
-            for key in list(self.selected_items):
-                try:
-                    run_sql_stmt(
-                        self.db_path,
-                        "DELETE FROM tickets WHERE key = ?",
-                        params=(key,),
-                        stmt_type="delete",
-                    )
-                except Exception:
-                    print(
-                        f"Error deleting ticket {key} from delete_all_selected_tickets"
-                    )
-                self.selected_items.remove(key)
-                for card_info in self.card_retainer:
-                    if card_info.get("key") == key:
-                        # print(f"{card_info=} from delete_all_selected_tickets")
-
+            keys = list(self.selected_items)
+            try:
+                deleted = delete_tickets(self.db_path, keys)
+                get_rank_index(self.db_path).remove(deleted.values())
+            except Exception as e:
+                print(f"Error deleting selected tickets from delete_all_selected_tickets: {e}")
+                return
+            removed = set(keys)
+            self.selected_items[:] = [key for key in self.selected_items if key not in removed]
+            retainers = [self.card_retainer]
+            if self.panel_choice:
+                retainers.append(self.panel_choice.get("card_retainer"))
+            for card_retainer in retainers:
+                if card_retainer is None:
+                    continue
+                for card_info in card_retainer:
+                    if card_info.get("key") in removed and card_info.get("widget") is not None:
                         try:
                             card_info["widget"].destroy()
                         except Exception:
                             print(
-                                f"Error destroying widget for {key} from delete_all_selected_tickets"
-                            )
-
-                        try:
-                            del card_info
-                        except Exception:
-                            print(
-                                f"Error deleting card_info for {key} from delete_all_selected_tickets"
+                                f"Error destroying widget for {card_info.get('key')} from delete_all_selected_tickets"
                             )
+                card_retainer[:] = [t for t in card_retainer if t.get("key") not in removed]
             self.update_toolbar_buttons()
-            # Robust refresh: reload tickets, sync card_retainer, and update UI
             if self.panel_choice and "ticket_panel" in self.panel_choice:
-                ticket_panel = self.panel_choice["ticket_panel"]
-                db_path = self.db_path
-                issues = run_sql_stmt(
-                    db_path,
-                    "SELECT * FROM tickets ORDER BY CAST(SUBSTR(key, INSTR(key, '-') + 1) AS INTEGER) DESC;",
-                    stmt_type="select",
-                )
-                ticket_panel.tickets = [{"key": issue[1]} for issue in issues]
-                valid_keys = set([t["key"] for t in ticket_panel.tickets])
-                card_retainer = self.panel_choice.get("card_retainer")
-                if card_retainer is not None:
-                    card_retainer[:] = [t for t in card_retainer if t.get("key") in valid_keys]
-                if "current_pg" in ticket_panel.widget_registry:
-                    pg_num = int(ticket_panel.widget_registry["current_pg"].cget("text"))
-                else:
-                    pg_num = 1
-                ticket_panel.set_page_contents(pg_num, self.selected_items)
+                self.panel_choice["ticket_panel"].refresh_page(keys)
 
         def cancel():
             cleanup_popup()
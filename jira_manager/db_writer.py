@@ -0,0 +1,110 @@
+import time
+from queue import Queue, Empty
+from threading import Thread, Event
+from jira_manager.sql_manager import upsert_ticket_page
+from jira_manager.page_index import get_rank_index
+
+# A group is committed once it holds this many tickets ...
+DEFAULT_BATCH_SIZE = 200
+# ... or this many seconds after its first write, whichever comes first
+DEFAULT_MAX_DELAY = 0.25
+
+
+class DatabaseWriter:
+    """
+    Owns every ingest write to db_path on a single thread. Fetch workers
+    queue tickets and the writer commits them in grouped transactions, so
+    workers only ever wait on the queue, never on SQLite locks.
+    """
+
+    def __init__(self, db_path, batch_size=DEFAULT_BATCH_SIZE, max_delay=DEFAULT_MAX_DELAY, max_pending=None):
+        self.db_path = db_path
+        self.batch_size = max(1, int(batch_size))
+        self.max_delay = max_delay
+        # Bounded so a slow disk pushes back on the fetch workers
+        self.queue = Queue(maxsize=max_pending or self.batch_size * 4)
+        self.error = None
+        self.stats = {"tickets": 0, "commits": 0}
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def write_ticket(self, key, type_key, field_rows, payload=None, search_document=None, card_summary=None):
+        # type_key is the (project, issuetype) the field rows belong to,
+        # payload, search_document and card_summary are prepared from the raw issue
+        self._put(("ticket", key, type_key, field_rows, payload, search_document, card_summary))
+
+    def after_commit(self, callback):
+        """
+        Runs callback on the writer thread once every write queued before it
+        has been committed. Skipped if a write fails.
+        """
+        self._put(("callback", callback))
+
+    def flush(self):
+        done = Event()
+        self._put(("flush", done))
+        done.wait()
+        if self.error:
+            raise self.error
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join()
+        if self.error:
+            raise self.error
+
+    def _put(self, item):
+        if self.error:
+            raise self.error
+        self.queue.put(item)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            tickets = int(item[0] == "ticket")
+            deadline = time.monotonic() + self.max_delay
+            while tickets < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                tickets += int(item[0] == "ticket")
+            self._commit(batch)
+
+    def _commit(self, batch):
+        if self.error is None:
+            try:
+                tickets = [item[1:] for item in batch if item[0] == "ticket"]
+                if tickets:
+                    ticket_ids = upsert_ticket_page(self.db_path, tickets)
+                    # Keeps board jumps current without rescanning tickets
+                    get_rank_index(self.db_path).add(ticket_ids.values())
+                    self.stats["tickets"] += len(tickets)
+                    self.stats["commits"] += 1
+            except Exception as e:
+                print(f"[DB Writer Error] {e}")
+                self.error = e
+
+        for item in batch:
+            if item[0] == "flush":
+                item[1].set()
+            elif item[0] == "callback" and self.error is None:
+                try:
+                    item[1]()
+                except Exception as e:
+                    print(f"[DB Writer Error] {e}")
+                    self.error = e
@@ -0,0 +1,345 @@
+import argparse
+import json
+import random
+import re
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from jira_manager.jql_planner import JQL_DATE_FORMAT, split_order_by
+
+# Jira Cloud caps /search/jql pages at 100 issues when fields are requested
+MAX_PAGE_SIZE = 100
+# ... and at 5000 when only keys are requested
+MAX_KEYS_PAGE_SIZE = 5000
+DATE_CLAUSE_PATTERN = re.compile(r'\b(created|updated)\s*(>=|<=|>|<)\s*"([^"]+)"', re.IGNORECASE)
+RELATIVE_DATE_PATTERN = re.compile(r"^-(\d+)([mhdw])$")
+RELATIVE_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+EDITMETA_FIELDS = {
+    "summary": {"name": "Summary", "schema": {"type": "string"}, "operations": ["set"]},
+    "description": {"name": "Description", "schema": {"type": "text"}, "operations": ["set"]},
+    "priority": {
+        "name": "Priority",
+        "schema": {"type": "option"},
+        "operations": ["set"],
+        "allowedValues": [{"name": "High"}, {"name": "Medium"}, {"name": "Low"}],
+    },
+    "labels": {
+        "name": "Labels",
+        "schema": {
+            "type": "array",
+            "custom": "com.atlassian.jira.plugin.system.customfieldtypes:labels",
+        },
+        "operations": ["add", "set", "remove"],
+    },
+    "duedate": {"name": "Due date", "schema": {"type": "date"}, "operations": ["set"]},
+}
+
+
+class FakeJiraDataset:
+    """
+    Deterministic synthetic issues, created one per `spacing` apart so created
+    date slices and relative updated clauses can be answered like Jira would.
+    """
+
+    def __init__(
+        self,
+        issue_count=1000,
+        projects=("BENCH",),
+        issue_types=3,
+        start=None,
+        spacing=timedelta(minutes=30),
+    ):
+        self.issue_count = int(issue_count)
+        self.projects = list(projects)
+        self.issue_types = max(1, int(issue_types))
+        self.start = start or datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.spacing = spacing
+        self.created = [self.start + self.spacing * i for i in range(self.issue_count)]
+        # Every issue is last updated some time after it was created
+        self.updated = [
+            created + timedelta(minutes=(i * 7919) % 10000)
+            for i, created in enumerate(self.created)
+        ]
+
+    def issue(self, index, expand_editmeta=False):
+        project = self.projects[index % len(self.projects)]
+        number = index // len(self.projects) + 1
+        issue = {
+            "id": str(10000 + index),
+            "key": f"{project}-{number}",
+            "fields": {
+                "project": {"key": project},
+                "issuetype": {"id": str(10001 + index % self.issue_types)},
+                "summary": f"Synthetic issue {index}",
+                "description": f"Generated by the fake Jira server for issue {index}.",
+                "priority": {"name": ("High", "Medium", "Low")[index % 3]},
+                "labels": [f"label{index % 7}"],
+                "duedate": None,
+                "created": format_jira_datetime(self.created[index]),
+                "updated": format_jira_datetime(self.updated[index]),
+            },
+        }
+        if expand_editmeta:
+            issue["editmeta"] = {"fields": EDITMETA_FIELDS}
+        return issue
+
+    def search(self, jql, now=None):
+        """
+        Returns the issue indexes matching the created/updated clauses of jql
+        in the requested created order. Other clauses are ignored.
+        """
+        now = now or datetime.now(timezone.utc)
+        where, order_by = split_order_by(jql)
+        low, high = 0, self.issue_count
+        updated_filters = []
+        for field, operator, value in DATE_CLAUSE_PATTERN.findall(where):
+            moment = parse_jql_date(value, now)
+            if moment is None:
+                continue
+            if field.lower() == "updated":
+                updated_filters.append((operator, moment))
+                continue
+            # created is sorted, so created bounds narrow a contiguous range
+            if operator == ">=":
+                low = max(low, bisect_left(self.created, moment))
+            elif operator == ">":
+                low = max(low, bisect_left(self.created, moment + timedelta(microseconds=1)))
+            elif operator == "<":
+                high = min(high, bisect_left(self.created, moment))
+            elif operator == "<=":
+                high = min(high, bisect_left(self.created, moment + timedelta(microseconds=1)))
+        indexes = [
+            i
+            for i in range(low, high)
+            if all(compare(self.updated[i], op, moment) for op, moment in updated_filters)
+        ]
+        if re.search(r"\bcreated\s+desc\b", order_by, re.IGNORECASE):
+            indexes.reverse()
+        return indexes
+
+    def find_key(self, key):
+        project, _, number = str(key).rpartition("-")
+        if project not in self.projects or not number.isdigit():
+            return None
+        index = (int(number) - 1) * len(self.projects) + self.projects.index(project)
+        return index if 0 <= index < self.issue_count else None
+
+
+def format_jira_datetime(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def parse_jql_date(value, now):
+    match = RELATIVE_DATE_PATTERN.match(value.strip())
+    if match:
+        return now - timedelta(seconds=int(match.group(1)) * RELATIVE_UNITS[match.group(2)])
+    try:
+        return datetime.strptime(value, JQL_DATE_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def compare(left, operator, right):
+    return {
+        ">=": left >= right,
+        ">": left > right,
+        "<": left < right,
+        "<=": left <= right,
+    }[operator]
+
+
+class FakeJiraServer:
+    """
+    Local stand-in for the Jira Cloud endpoints the app uses. Each request
+    waits `latency` seconds (+/- jitter), then fails with a 500 at
+    `error_rate` or a 429 with Retry-After at `throttle_rate`.
+    """
+
+    def __init__(
+        self,
+        dataset=None,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        retry_after=1,
+        seed=None,
+    ):
+        self.dataset = dataset or FakeJiraDataset()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self.stats = {"search": 0, "approximate_count": 0, "editmeta": 0, "errors": 0, "throttled": 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _injected_failure(self):
+        # Returns the (status, headers) to fail with, or None to serve normally
+        with self._lock:
+            roll = self._random.random()
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        if delay:
+            time.sleep(delay)
+        if roll < self.error_rate:
+            self._count("errors")
+            return 500, {}
+        if roll < self.error_rate + self.throttle_rate:
+            self._count("throttled")
+            return 429, {"Retry-After": str(self.retry_after)}
+        return None
+
+    def search_page(self, body):
+        expand = str(body.get("expand", ""))
+        keys_only = body.get("fields") == ["key"]
+        indexes = self.dataset.search(str(body.get("jql", "")))
+        start = int(body.get("nextPageToken") or 0)
+        limit = MAX_KEYS_PAGE_SIZE if keys_only else MAX_PAGE_SIZE
+        size = max(1, min(int(body.get("maxResults") or limit), limit))
+        page = indexes[start : start + size]
+        if keys_only:
+            issues = [{"key": self.dataset.issue(i)["key"]} for i in page]
+        else:
+            issues = [self.dataset.issue(i, expand_editmeta="editmeta" in expand) for i in page]
+        data = {"issues": issues}
+        if start + size < len(indexes):
+            data["nextPageToken"] = str(start + size)
+        return data
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, data=None, headers=None):
+                body = json.dumps(data if data is not None else {}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if not length:
+                    return {}
+                return json.loads(self.rfile.read(length))
+
+            def do_POST(self):
+                body = self._read_json()
+                failure = server._injected_failure()
+                if failure:
+                    return self._send(failure[0], {"errorMessages": ["Injected failure"]}, failure[1])
+                if self.path.startswith("/rest/api/3/search/jql"):
+                    server._count("search")
+                    if str(body.get("nextPageToken") or "0").isdigit():
+                        return self._send(200, server.search_page(body))
+                    return self._send(400, {"errorMessages": ["Invalid nextPageToken"]})
+                if self.path.startswith("/rest/api/3/search/approximate-count"):
+                    server._count("approximate_count")
+                    count = len(server.dataset.search(str(body.get("jql", ""))))
+                    return self._send(200, {"count": count})
+                self._send(404, {"errorMessages": ["Not found"]})
+
+            def do_GET(self):
+                failure = server._injected_failure()
+                if failure:
+                    return self._send(failure[0], {"errorMessages": ["Injected failure"]}, failure[1])
+                if self.path.startswith("/rest/api/3/myself"):
+                    # The fake reads absolute JQL dates in UTC
+                    return self._send(200, {"timeZone": "UTC"})
+                match = re.match(r"^/rest/api/3/issue/([^/]+)/editmeta", self.path)
+                if match:
+                    server._count("editmeta")
+                    if server.dataset.find_key(match.group(1)) is None:
+                        return self._send(404, {"errorMessages": ["Issue does not exist"]})
+                    return self._send(200, {"fields": EDITMETA_FIELDS})
+                self._send(404, {"errorMessages": ["Not found"]})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--issues", type=int, default=1000, help="Number of synthetic issues")
+    parser.add_argument("--projects", default="BENCH", help="Comma separated project keys")
+    parser.add_argument("--issue-types", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def server_from_args(args, port=0):
+    dataset = FakeJiraDataset(
+        issue_count=args.issues,
+        projects=[p.strip() for p in args.projects.split(",") if p.strip()],
+        issue_types=args.issue_types,
+    )
+    return FakeJiraServer(
+        dataset,
+        port=port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Jira Cloud API for local testing.")
+    add_server_arguments(parser)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    server = server_from_args(args, port=args.port).start()
+    print(f"Fake Jira with {args.issues} issues listening on {server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
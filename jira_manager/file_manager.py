@@ -44,6 +44,12 @@ def load_data() -> dict:
             "proxy_option": "No",
             "theme": "Dark",
             "thread_count": "safe_mode",
+            "editmeta_mode": "shared",
+            "search_warn_limit": 10000,
+            "search_max_results": 100000,
+            "delta_sync": True,
+            "local_jql": True,
+            "local_jql_max_age_minutes": 15,
         }
         save_data(payload)
 
@@ -0,0 +1,163 @@
+import time
+import requests
+from collections import deque
+from threading import Lock
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from jira_manager.rate_limiter import (
+    RequestScheduler,
+    RETRY_STATUSES,
+    parse_retry_after,
+    compute_backoff,
+)
+
+# (connect, read) timeouts in seconds for every Jira call
+DEFAULT_TIMEOUT = (10, 120)
+DEFAULT_POOL_SIZE = 8
+DEFAULT_MAX_RETRIES = 6
+
+
+def build_url(server, path):
+    # Server urls are saved both with and without a trailing slash
+    return f"{str(server).rstrip('/')}/{path.lstrip('/')}"
+
+
+class JiraClient:
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        proxies=None,
+        max_retries=DEFAULT_MAX_RETRIES,
+    ):
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self.proxies = proxies
+        self.max_retries = max_retries
+        self.scheduler = RequestScheduler(max_concurrency=self.pool_size)
+        self.session = requests.Session()
+        # Keep-alive pool shared by every worker thread, blocking when all
+        # connections are busy instead of opening throwaway sockets
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._stats_lock = Lock()
+        self._latencies = deque(maxlen=10000)
+        self.reset_stats()
+
+    def request(self, method, url, headers=None, proxies=None, timeout=None, **kwargs):
+        """
+        Sends a request through the per-server scheduler, retrying 429/503
+        responses after Retry-After or a jittered exponential backoff.
+        """
+        throttle = self.scheduler.for_url(url)
+        attempt = 0
+        while True:
+            throttle.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    proxies=proxies if proxies is not None else self.proxies,
+                    timeout=timeout or self.timeout,
+                    **kwargs,
+                )
+            except RequestException:
+                throttle.release()
+                self._record(time.perf_counter() - start, error=True)
+                raise
+            throttled = response.status_code in RETRY_STATUSES
+            throttle.release(throttled)
+            self._record(time.perf_counter() - start, error=response.status_code >= 400)
+            if not throttled or attempt >= self.max_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                throttle.block_for(retry_after)
+                delay = retry_after
+            else:
+                delay = compute_backoff(attempt)
+            print(f"Jira returned {response.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            response.close()
+            with self._stats_lock:
+                self._stats["retries"] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def _record(self, latency, error=False):
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["total_latency"] += latency
+            self._stats["max_latency"] = max(self._stats["max_latency"], latency)
+            if error:
+                self._stats["errors"] += 1
+            self._latencies.append(latency)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = {
+                "requests": 0,
+                "errors": 0,
+                "total_latency": 0.0,
+                "max_latency": 0.0,
+                "retries": 0,
+            }
+            self._latencies.clear()
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+            latencies = sorted(self._latencies)
+        count = stats["requests"]
+        stats["avg_latency"] = stats["total_latency"] / count if count else 0.0
+        stats["p50_latency"] = percentile(latencies, 50)
+        stats["p99_latency"] = percentile(latencies, 99)
+        stats["concurrency_limits"] = self.scheduler.get_limits()
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+_client = None
+_client_lock = Lock()
+
+
+def configure_client(pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, proxies=None):
+    """
+    Replaces the shared client, e.g. once main() knows the thread allotment.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = JiraClient(pool_size=pool_size, timeout=timeout, proxies=proxies)
+        return _client
+
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = JiraClient()
+        return _client
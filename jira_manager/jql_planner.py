@@ -0,0 +1,195 @@
+import re
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from requests.exceptions import RequestException
+from jira_manager.jira_client import get_client, build_url
+
+JQL_DATE_FORMAT = "%Y/%m/%d %H:%M"
+ORDER_BY_PATTERN = re.compile(r"\border\s+by\b", re.IGNORECASE)
+PAGE_SIZE = 100
+# Slicing only pays off once each slice spans several pages
+ISSUES_PER_SLICE = 1000
+DEFAULT_SEARCH_WARN_LIMIT = 10000
+DEFAULT_SEARCH_MAX_RESULTS = 100000
+# Jira pages up to 5000 issues when only keys are requested
+KEYS_PAGE_SIZE = 5000
+
+
+def split_order_by(jql):
+    """
+    Splits a JQL statement into (where_clause, order_by_clause), ignoring
+    ORDER BY text that appears inside quoted strings.
+    """
+    quote = None
+    i = 0
+    while i < len(jql):
+        char = jql[i]
+        if quote:
+            if char == "\\":
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        else:
+            match = ORDER_BY_PATTERN.match(jql, i)
+            if match and (i == 0 or not (jql[i - 1].isalnum() or jql[i - 1] == "_")):
+                return jql[:i].strip(), jql[i:].strip()
+        i += 1
+    return jql.strip(), ""
+
+
+def and_clause(jql, clause):
+    """
+    Returns jql narrowed by an extra clause, keeping its ORDER BY at the end.
+    """
+    where, order_by = split_order_by(jql)
+    combined = f"({where}) AND {clause}" if where else clause
+    return f"{combined} {order_by}".strip()
+
+
+def parse_jira_datetime(value):
+    # Jira returns e.g. 2024-05-01T09:30:12.000+0000
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def format_jql_date(value, jira_timezone=timezone.utc):
+    return value.astimezone(jira_timezone).strftime(JQL_DATE_FORMAT)
+
+
+# server -> profile timezone, asked once per session
+_jira_timezones = {}
+
+
+def fetch_jira_timezone(config_data, headers, proxies):
+    """
+    Returns the timezone Jira reads absolute JQL dates in, which is the
+    user's profile timezone, falling back to UTC.
+    """
+    server = config_data.get("server")
+    if server in _jira_timezones:
+        return _jira_timezones[server]
+    try:
+        response = get_client().get(
+            build_url(server, "rest/api/3/myself"),
+            headers=headers,
+            proxies=proxies,
+        )
+        if response.status_code == 200:
+            # Only a real answer is cached, a failure is retried next time
+            _jira_timezones[server] = ZoneInfo(response.json().get("timeZone") or "UTC")
+            return _jira_timezones[server]
+        print(f"Jira timezone unavailable: {response.status_code}")
+    except (RequestException, ValueError, ZoneInfoNotFoundError) as e:
+        print(f"Jira timezone unavailable: {e}")
+    return timezone.utc
+
+
+def plan_created_slices(jql, oldest, newest, slice_count):
+    """
+    Splits jql into disjoint slices over equal created-date windows between
+    oldest and newest. The first and last slices are open ended so together
+    the slices cover exactly the original result set.
+    """
+    if slice_count <= 1 or oldest is None or newest is None or newest <= oldest:
+        return [jql]
+    step = (newest - oldest) / slice_count
+    boundaries = []
+    for i in range(1, slice_count):
+        # JQL dates only have minute precision, so drop collapsed windows
+        boundary = format_jql_date(oldest + step * i)
+        if boundary not in boundaries:
+            boundaries.append(boundary)
+    if not boundaries:
+        return [jql]
+
+    slices = [and_clause(jql, f'created < "{boundaries[0]}"')]
+    for lower, upper in zip(boundaries, boundaries[1:]):
+        slices.append(and_clause(jql, f'created >= "{lower}" AND created < "{upper}"'))
+    slices.append(and_clause(jql, f'created >= "{boundaries[-1]}"'))
+    return slices
+
+
+def fetch_created_edge(config_data, jql, headers, proxies, direction):
+    where, _ = split_order_by(jql)
+    probe = f"({where}) ORDER BY created {direction}" if where else f"ORDER BY created {direction}"
+    response = get_client().post(
+        build_url(config_data.get("server"), "rest/api/3/search/jql"),
+        headers=headers,
+        proxies=proxies,
+        json={"jql": probe, "maxResults": 1, "fields": ["created"]},
+    )
+    response.raise_for_status()
+    issues = response.json().get("issues", [])
+    if not issues:
+        return None
+    return parse_jira_datetime((issues[0].get("fields") or {}).get("created"))
+
+
+def plan_search_slices(config_data, jql, headers, proxies, slice_count):
+    """
+    Probes the oldest and newest created dates for jql and returns the list
+    of disjoint sub-queries to fetch in parallel.
+    """
+    if slice_count <= 1:
+        return [jql]
+    oldest = fetch_created_edge(config_data, jql, headers, proxies, "ASC")
+    if oldest is None:
+        return [jql]
+    newest = fetch_created_edge(config_data, jql, headers, proxies, "DESC")
+    return plan_created_slices(jql, oldest, newest, slice_count)
+
+
+def fetch_approximate_count(config_data, jql, headers, proxies):
+    """
+    Asks Jira for the approximate size of a JQL result before fetching it.
+    Returns None when the server does not support the endpoint.
+    """
+    where, _ = split_order_by(jql)
+    response = get_client().post(
+        build_url(config_data.get("server"), "rest/api/3/search/approximate-count"),
+        headers=headers,
+        proxies=proxies,
+        json={"jql": where},
+    )
+    if response.status_code != 200:
+        print(f"Approximate count unavailable: {response.status_code} {response.text}")
+        return None
+    return response.json().get("count")
+
+
+def fetch_result_keys(config_data, jql, headers, proxies):
+    """
+    Returns the key of every issue jql matches, requesting only keys so a
+    large result costs a few requests.
+    """
+    where, _ = split_order_by(jql)
+    url = build_url(config_data.get("server"), "rest/api/3/search/jql")
+    body = {"jql": where, "fields": ["key"], "maxResults": KEYS_PAGE_SIZE}
+    keys = []
+    while True:
+        response = get_client().post(url, headers=headers, proxies=proxies, json=body)
+        response.raise_for_status()
+        data = response.json()
+        keys.extend(str(issue.get("key", "")) for issue in data.get("issues", []))
+        if not data.get("nextPageToken"):
+            return keys
+        body["nextPageToken"] = data["nextPageToken"]
+
+
+def plan_fetch_concurrency(approximate_count, thread_count):
+    """
+    Returns (slice_count, worker_count) sized to the expected result so small
+    searches don't pay for range probes and idle threads.
+    """
+    thread_count = max(1, int(thread_count))
+    if approximate_count is None:
+        return thread_count, thread_count
+    slice_count = min(thread_count, max(1, -(-approximate_count // ISSUES_PER_SLICE)))
+    worker_count = min(thread_count, max(1, -(-approximate_count // PAGE_SIZE)))
+    return slice_count, worker_count
@@ -0,0 +1,484 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from jira_manager.sql_manager import run_sql_stmt, register_sql_function
+from jira_manager.payload_store import decode_payload
+from jira_manager.jql_planner import parse_jira_datetime
+
+TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<op>!=|!~|>=|<=|=|~|>|<)
+        |(?P<punct>[(),])
+        |(?P<word>[^\s"'(),=!~<>]+)
+    )""",
+    re.VERBOSE,
+)
+KEYWORDS = {"and", "or", "not", "in", "is", "empty", "null", "order", "by", "asc", "desc"}
+RELATIVE_DATE_PATTERN = re.compile(r"^([-+]?)(\d+)([wdhm])$")
+RELATIVE_UNITS = {"w": timedelta(weeks=1), "d": timedelta(days=1), "h": timedelta(hours=1), "m": timedelta(minutes=1)}
+ABSOLUTE_DATE_FORMATS = ("%Y/%m/%d %H:%M", "%Y-%m-%d %H:%M", "%Y/%m/%d", "%Y-%m-%d")
+SQL_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Lucene syntax in a ~ value that plain FTS tokens can't reproduce
+TEXT_OPERATOR_PATTERN = re.compile(r'[?~"!^(){}\[\]\\&|]|\*\w|(?:^|\s)[-+]|\b(?:AND|OR|NOT)\b')
+TEXT_TERM_PATTERN = re.compile(r"(\w+)(\*?)", re.UNICODE)
+
+FIELD_ALIASES = {
+    "issuekey": "key",
+    "type": "issuetype",
+    "component": "components",
+    "fixversion": "fixVersions",
+    "affectedversion": "versions",
+    "resolved": "resolutiondate",
+    "due": "duedate",
+}
+# Searched through the FTS index, "text" covers every indexed column
+TEXT_FIELDS = {"text": None, "summary": "summary", "description": "description"}
+DATE_FIELDS = {"created", "updated", "duedate", "resolutiondate"}
+VALUE_FIELDS = {
+    "project",
+    "status",
+    "assignee",
+    "reporter",
+    "creator",
+    "priority",
+    "issuetype",
+    "labels",
+    "resolution",
+    "components",
+    "fixVersions",
+    "versions",
+    "statusCategory",
+}
+# JQL fields stored inside another field of the payload
+NESTED_FIELDS = {"statusCategory": ("status", "statusCategory")}
+SORT_TEXT_FIELDS = {"summary", "assignee", "reporter", "creator", "issuetype", "resolution"}
+
+
+class UnsupportedJQL(ValueError):
+    """
+    Raised when a query uses JQL this engine can't answer exactly, so the
+    caller should send it to Jira instead.
+    """
+
+
+@lru_cache(maxsize=256)
+def cached_issue_fields(codec, payload):
+    # Several clauses of one query read the same row's payload
+    return decode_payload(codec, payload).get("fields") or {}
+
+
+def value_labels(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [label for item in value for label in value_labels(item)]
+    if isinstance(value, dict):
+        return [
+            str(value[name]).lower()
+            for name in ("key", "name", "value", "displayName", "emailAddress", "accountId", "id")
+            if value.get(name) not in (None, "")
+        ]
+    return [str(value).lower()]
+
+
+def jql_values(codec, payload, field_id):
+    """
+    SQL function: every matchable label of an issue field as a JSON array of
+    lowercase strings, empty when the field is empty.
+    """
+    if payload is None:
+        return "[]"
+    fields = cached_issue_fields(codec, payload)
+    if field_id in NESTED_FIELDS:
+        parent, child = NESTED_FIELDS[field_id]
+        value = (fields.get(parent) or {}).get(child)
+    else:
+        value = fields.get(field_id)
+    return json.dumps(value_labels(value))
+
+
+def jql_date(codec, payload, field_id):
+    # SQL function: the field as a sortable UTC timestamp string, or NULL
+    if payload is None:
+        return None
+    value = cached_issue_fields(codec, payload).get(field_id)
+    if not value:
+        return None
+    parsed = parse_jira_datetime(value)
+    if parsed is None:
+        try:
+            parsed = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+    return parsed.astimezone(timezone.utc).strftime(SQL_DATE_FORMAT)
+
+
+def jql_sort_text(codec, payload, field_id):
+    if payload is None:
+        return None
+    value = cached_issue_fields(codec, payload).get(field_id)
+    if isinstance(value, dict):
+        value = value.get("displayName") or value.get("name") or value.get("value")
+    return str(value).lower() if value else None
+
+
+register_sql_function("jql_values", 3, jql_values)
+register_sql_function("jql_date", 3, jql_date)
+register_sql_function("jql_sort_text", 3, jql_sort_text)
+
+
+def tokenize(jql):
+    tokens = []
+    position = 0
+    jql = jql.strip()
+    while position < len(jql):
+        match = TOKEN_PATTERN.match(jql, position)
+        if not match or match.end() == position:
+            raise UnsupportedJQL(f"Unexpected text at: {jql[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        text = match.group(kind)
+        if kind == "string":
+            text = re.sub(r"\\(.)", r"\1", text[1:-1])
+        tokens.append((kind, text))
+    return tokens
+
+
+def parse_date_value(text, now=None, jira_timezone=timezone.utc):
+    """
+    Returns a relative ("-7d") or absolute ("2024/05/01 09:30") JQL date as
+    a UTC SQL timestamp string. Absolute dates are read in jira_timezone,
+    the user's profile timezone, like Jira does.
+    """
+    now = now or datetime.now(timezone.utc)
+    match = RELATIVE_DATE_PATTERN.match(text.strip())
+    if match:
+        sign, amount, unit = match.groups()
+        delta = RELATIVE_UNITS[unit] * int(amount)
+        moment = now - delta if sign == "-" else now + delta
+        return moment.strftime(SQL_DATE_FORMAT)
+    for fmt in ABSOLUTE_DATE_FORMATS:
+        try:
+            moment = datetime.strptime(text.strip(), fmt).replace(tzinfo=jira_timezone)
+        except ValueError:
+            continue
+        return moment.astimezone(timezone.utc).strftime(SQL_DATE_FORMAT)
+    raise UnsupportedJQL(f"Unsupported date value: {text!r}")
+
+
+def build_text_match(value):
+    """
+    Turns a ~ value into an FTS5 MATCH expression requiring every word as a
+    whole token, as Jira does. Only a trailing * asks for a prefix match.
+    """
+    if TEXT_OPERATOR_PATTERN.search(value):
+        raise UnsupportedJQL(f"Unsupported text search syntax in {value!r}")
+    terms = [f'"{word}"{wildcard}' for word, wildcard in TEXT_TERM_PATTERN.findall(value)]
+    if not terms:
+        raise UnsupportedJQL(f"Nothing to search for in {value!r}")
+    return " ".join(terms)
+
+
+class JQLCompiler:
+    """
+    Recursive descent compiler from a JQL subset to parameterized SQL over
+    tickets, their stored payloads and the FTS index.
+    """
+
+    def __init__(self, jql, custom_fields=None, now=None, jira_timezone=timezone.utc):
+        self.tokens = tokenize(jql)
+        self.position = 0
+        # field name (lowercase) -> (field_key, field_type) from field_definitions
+        self.custom_fields = custom_fields or {}
+        self.now = now
+        self.jira_timezone = jira_timezone
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def peek_word(self, offset=0):
+        kind, text = self.peek(offset)
+        return text.lower() if kind == "word" else None
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise UnsupportedJQL("Unexpected end of query")
+        self.position += 1
+        return token
+
+    def expect_word(self, word):
+        if self.peek_word() != word:
+            raise UnsupportedJQL(f"Expected {word.upper()}")
+        self.take()
+
+    def expect_punct(self, punct):
+        if self.peek() != ("punct", punct):
+            raise UnsupportedJQL(f"Expected {punct!r}")
+        self.take()
+
+    def compile(self):
+        """
+        Returns (where_sql, order_sql, params).
+        """
+        params = []
+        where = "1"
+        if self.peek()[0] is not None and self.peek_word() != "order":
+            where = self.parse_or(params)
+        order = "t.ticket_id DESC"
+        if self.peek_word() == "order":
+            self.take()
+            self.expect_word("by")
+            order = self.parse_order_by(params)
+        if self.peek()[0] is not None:
+            raise UnsupportedJQL(f"Unexpected {self.peek()[1]!r}")
+        return where, order, params
+
+    def parse_or(self, params):
+        parts = [self.parse_and(params)]
+        while self.peek_word() == "or":
+            self.take()
+            parts.append(self.parse_and(params))
+        return parts[0] if len(parts) == 1 else "(" + " OR ".join(parts) + ")"
+
+    def parse_and(self, params):
+        parts = [self.parse_not(params)]
+        while self.peek_word() == "and":
+            self.take()
+            parts.append(self.parse_not(params))
+        return parts[0] if len(parts) == 1 else "(" + " AND ".join(parts) + ")"
+
+    def parse_not(self, params):
+        if self.peek_word() == "not":
+            self.take()
+            return f"NOT {self.parse_not(params)}"
+        if self.peek() == ("punct", "("):
+            self.take()
+            inner = self.parse_or(params)
+            self.expect_punct(")")
+            return inner
+        return self.parse_clause(params)
+
+    def resolve_field(self, name):
+        """
+        Returns (kind, field_id) for a JQL field name.
+        """
+        lowered = name.lower()
+        match = re.fullmatch(r"cf\[(\d+)\]", lowered)
+        if match:
+            return "value", f"customfield_{match.group(1)}"
+        if re.fullmatch(r"customfield_\d+", lowered):
+            return "value", lowered
+        field_id = FIELD_ALIASES.get(lowered, name)
+        for known in VALUE_FIELDS | DATE_FIELDS | set(TEXT_FIELDS) | {"key"}:
+            if known.lower() == field_id.lower():
+                field_id = known
+                break
+        if field_id == "key":
+            return "key", "key"
+        if field_id in TEXT_FIELDS:
+            return "text", field_id
+        if field_id in DATE_FIELDS:
+            return "date", field_id
+        if field_id in VALUE_FIELDS:
+            return "value", field_id
+        if lowered in self.custom_fields:
+            field_key, field_type = self.custom_fields[lowered]
+            return ("date" if field_type in ("date", "datetime") else "value"), field_key
+        raise UnsupportedJQL(f"Unsupported field: {name}")
+
+    def parse_value(self):
+        kind, text = self.take()
+        if kind == "string":
+            return text
+        if kind == "word" and text.lower() not in KEYWORDS:
+            if self.peek() == ("punct", "("):
+                raise UnsupportedJQL(f"Unsupported function: {text}()")
+            return text
+        raise UnsupportedJQL(f"Expected a value, got {text!r}")
+
+    def parse_value_list(self):
+        self.expect_punct("(")
+        values = [self.parse_value()]
+        while self.peek() == ("punct", ","):
+            self.take()
+            values.append(self.parse_value())
+        self.expect_punct(")")
+        return values
+
+    def parse_clause(self, params):
+        kind, name = self.take()
+        if kind not in ("word", "string") or (kind == "word" and name.lower() in KEYWORDS):
+            raise UnsupportedJQL(f"Expected a field, got {name!r}")
+        field_kind, field_id = self.resolve_field(name)
+
+        word = self.peek_word()
+        if word == "is":
+            self.take()
+            negate = False
+            if self.peek_word() == "not":
+                self.take()
+                negate = True
+            if self.peek_word() not in ("empty", "null"):
+                raise UnsupportedJQL("Expected EMPTY after IS")
+            self.take()
+            return self.empty_sql(field_kind, field_id, not negate, params)
+        if word in ("in", "not"):
+            self.take()
+            negate = word == "not"
+            if negate:
+                self.expect_word("in")
+            values = self.parse_value_list()
+            return self.in_sql(field_kind, field_id, values, negate, params)
+
+        op_kind, op = self.take()
+        if op_kind != "op":
+            raise UnsupportedJQL(f"Expected an operator after {name}")
+        if self.peek_word() in ("empty", "null") and op in ("=", "!="):
+            self.take()
+            return self.empty_sql(field_kind, field_id, op == "=", params)
+        value = self.parse_value()
+        if op in ("~", "!~"):
+            return self.text_sql(field_kind, field_id, value, op == "!~", params)
+        if op in ("=", "!="):
+            return self.in_sql(field_kind, field_id, [value], op == "!=", params)
+        return self.compare_sql(field_kind, field_id, op, value, params)
+
+    def empty_sql(self, field_kind, field_id, is_empty, params):
+        if field_kind == "key":
+            return "0" if is_empty else "1"
+        if field_kind == "date":
+            params.append(field_id)
+            return f"jql_date(p.codec, p.payload, ?) IS {'' if is_empty else 'NOT '}NULL"
+        if field_kind == "text":
+            raise UnsupportedJQL(f"IS EMPTY is not supported for {field_id}")
+        params.append(field_id)
+        return f"json_array_length(jql_values(p.codec, p.payload, ?)) {'=' if is_empty else '>'} 0"
+
+    def in_sql(self, field_kind, field_id, values, negate, params):
+        placeholders = ", ".join("?" for _ in values)
+        if field_kind == "key":
+            params.extend(value.upper() for value in values)
+            return f"UPPER(t.key) {'NOT ' if negate else ''}IN ({placeholders})"
+        if field_kind != "value":
+            raise UnsupportedJQL(f"= and IN are not supported for {field_id}")
+        params.append(field_id)
+        params.extend(value.lower() for value in values)
+        exists = f"EXISTS (SELECT 1 FROM json_each(jql_values(p.codec, p.payload, ?)) WHERE value IN ({placeholders}))"
+        if not negate:
+            return exists
+        # Like Jira, != and NOT IN never match issues where the field is empty
+        params.append(field_id)
+        return f"(NOT {exists} AND json_array_length(jql_values(p.codec, p.payload, ?)) > 0)"
+
+    def text_sql(self, field_kind, field_id, value, negate, params):
+        if field_kind != "text":
+            raise UnsupportedJQL(f"~ is only supported for text fields, not {field_id}")
+        match = build_text_match(value)
+        column = TEXT_FIELDS[field_id]
+        params.append(f"{column} : ({match})" if column else match)
+        return f"t.ticket_id {'NOT ' if negate else ''}IN (SELECT rowid FROM ticket_search WHERE ticket_search MATCH ?)"
+
+    def compare_sql(self, field_kind, field_id, op, value, params):
+        if field_kind != "date":
+            raise UnsupportedJQL(f"{op} is only supported for date fields, not {field_id}")
+        params.append(field_id)
+        params.append(parse_date_value(value, self.now, self.jira_timezone))
+        return f"jql_date(p.codec, p.payload, ?) {op} ?"
+
+    def parse_order_by(self, params):
+        terms = []
+        tie_break = "t.ticket_id DESC"
+        while True:
+            kind, name = self.take()
+            if kind not in ("word", "string"):
+                raise UnsupportedJQL(f"Expected a field to order by, got {name!r}")
+            field_kind, field_id = self.resolve_field(name)
+            direction = "ASC"
+            if self.peek_word() in ("asc", "desc"):
+                direction = self.take()[1].upper()
+            if field_kind == "key":
+                terms.append(f"t.project_key {direction}")
+                terms.append(f"t.issue_number {direction}")
+            elif field_kind == "date":
+                params.append(field_id)
+                terms.append(f"jql_date(p.codec, p.payload, ?) {direction}")
+            elif field_id in ("summary", "assignee"):
+                # Stored on tickets for the cards, no payload decode needed
+                terms.append(f"t.{field_id} COLLATE NOCASE {direction}")
+            elif field_id in SORT_TEXT_FIELDS:
+                params.append(field_id)
+                terms.append(f"jql_sort_text(p.codec, p.payload, ?) {direction}")
+            else:
+                # Jira orders status, priority etc. by scheme, which we don't store
+                raise UnsupportedJQL(f"Ordering by {field_id} is not supported")
+            # After key, a tie-break in the same direction lets
+            # idx_tickets_project_number, which ends in ticket_id, serve the
+            # whole ORDER BY without a sort
+            tie_break = f"t.ticket_id {direction}" if field_kind == "key" else "t.ticket_id DESC"
+            if self.peek() != ("punct", ","):
+                break
+            self.take()
+        terms.append(tie_break)
+        return ", ".join(terms)
+
+
+def load_custom_fields(db_path):
+    rows = run_sql_stmt(
+        db_path,
+        "SELECT DISTINCT field_name, field_key, field_type FROM field_definitions WHERE field_name IS NOT NULL",
+        stmt_type="select",
+    )
+    return {str(name).lower(): (field_key, field_type) for name, field_key, field_type in rows or []}
+
+
+def compile_jql(jql, custom_fields=None, now=None, query_id=None, jira_timezone=timezone.utc):
+    """
+    Compiles a supported JQL query to (sql, params) returning
+    (ticket_id, key) rows. With query_id only the tickets recorded for that
+    saved query are considered. Raises UnsupportedJQL otherwise.
+    """
+    where, order, params = JQLCompiler(jql, custom_fields, now, jira_timezone).compile()
+    if query_id is not None:
+        where = f"t.ticket_id IN (SELECT ticket_id FROM saved_query_results WHERE query_id = ?) AND ({where})"
+        params.insert(0, query_id)
+    sql = f"""
+        SELECT t.ticket_id, t.key FROM tickets t
+        LEFT JOIN ticket_payloads p ON p.ticket_id = t.ticket_id
+        WHERE {where}
+        ORDER BY {order}
+    """
+    return sql, params
+
+
+def run_local_jql(db_path, jql, query_id, jira_timezone=timezone.utc):
+    """
+    Answers jql from the tickets the saved query query_id last returned,
+    reading absolute dates in jira_timezone.
+    Raises UnsupportedJQL when the query or the local data can't give the
+    same answer Jira would.
+    """
+    missing = run_sql_stmt(
+        db_path,
+        """
+        SELECT COUNT(*) FROM saved_query_results r
+        WHERE r.query_id = ?
+        AND NOT EXISTS (SELECT 1 FROM ticket_payloads p WHERE p.ticket_id = r.ticket_id)
+        """,
+        stmt_type="select",
+        params=(query_id,),
+    )
+    if missing and missing[0][0]:
+        raise UnsupportedJQL(f"{missing[0][0]} result tickets have no payload yet")
+    sql, params = compile_jql(
+        jql, load_custom_fields(db_path), query_id=query_id, jira_timezone=jira_timezone
+    )
+    rows = run_sql_stmt(db_path, sql, stmt_type="select", params=tuple(params))
+    if rows is None:
+        raise UnsupportedJQL("The local query failed")
+    return rows
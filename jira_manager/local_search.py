@@ -0,0 +1,146 @@
+import re
+from jira_manager.sql_manager import run_sql_stmt
+
+SEARCH_PAGE_SIZE = 50
+# bm25 column weights for key, summary, description and other field text
+BM25_WEIGHTS = (10.0, 5.0, 1.0, 0.5)
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+# ADF nodes that end a line of text
+ADF_BLOCK_TYPES = {"paragraph", "heading", "listItem", "blockquote", "codeBlock", "tableRow", "rule"}
+
+
+def adf_to_text(node):
+    """
+    Flattens an Atlassian Document Format value (as returned for description
+    and rich text fields) into plain text.
+    """
+    if node is None:
+        return ""
+    if isinstance(node, str):
+        return node
+    if isinstance(node, list):
+        return "".join(adf_to_text(child) for child in node)
+    if not isinstance(node, dict):
+        return str(node)
+    node_type = node.get("type")
+    if node_type == "text":
+        return node.get("text", "")
+    if node_type == "hardBreak":
+        return "\n"
+    if node_type == "mention":
+        return (node.get("attrs") or {}).get("text", "")
+    text = adf_to_text(node.get("content"))
+    if node_type in ADF_BLOCK_TYPES:
+        text += "\n"
+    return text
+
+
+def value_to_text(value):
+    # Users, options and versions are dicts, only their labels are searchable
+    if value is None or isinstance(value, (bool, int, float)):
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return " ".join(filter(None, (value_to_text(item) for item in value)))
+    if isinstance(value, dict):
+        if value.get("type") == "doc":
+            return adf_to_text(value)
+        return " ".join(
+            str(value[label])
+            for label in ("key", "name", "value", "displayName")
+            if isinstance(value.get(label), str)
+        )
+    return ""
+
+
+def build_search_document(issue):
+    """
+    Returns the (key, summary, description, field_text) row indexed for an issue.
+    """
+    fields = issue.get("fields") or {}
+    field_text = " ".join(
+        filter(
+            None,
+            (
+                value_to_text(value)
+                for field_key, value in fields.items()
+                if field_key not in ("summary", "description")
+            ),
+        )
+    )
+    return (
+        str(issue.get("key", "")),
+        value_to_text(fields.get("summary")),
+        adf_to_text(fields.get("description")).strip(),
+        field_text,
+    )
+
+
+def build_card_summary(issue):
+    """
+    Returns the (summary, status, assignee, priority, updated) shown on an
+    issue's ticket card.
+    """
+    fields = issue.get("fields") or {}
+
+    def label(value, name="name"):
+        return value.get(name) if isinstance(value, dict) else None
+
+    return (
+        value_to_text(fields.get("summary")) or None,
+        label(fields.get("status")),
+        label(fields.get("assignee"), "displayName"),
+        label(fields.get("priority")),
+        fields.get("updated"),
+    )
+
+
+def build_match_query(text):
+    """
+    Turns free text into an FTS5 MATCH expression that requires every word
+    as a prefix, or None when there is nothing to search for.
+    """
+    tokens = TOKEN_PATTERN.findall(text or "")
+    if not tokens:
+        return None
+    # Quoting keeps FTS5 operators typed by the user from being interpreted
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def count_search_results(db_path, text):
+    match = build_match_query(text)
+    if match is None:
+        return 0
+    rows = run_sql_stmt(
+        db_path,
+        "SELECT COUNT(*) FROM ticket_search WHERE ticket_search MATCH ?",
+        stmt_type="select",
+        params=(match,),
+    )
+    return rows[0][0] if rows else 0
+
+
+def search_tickets(db_path, text, after=None, limit=SEARCH_PAGE_SIZE):
+    """
+    Returns up to limit (ticket_id, key, score) rows ranked best first.
+    Pass the (score, ticket_id) of the last row as after for the next page.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return []
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    # bm25 scores are lower for better matches, ticket_id breaks ties
+    sql = f"""
+        SELECT ticket_id, key, score FROM (
+            SELECT rowid AS ticket_id, key, bm25(ticket_search, {weights}) AS score
+            FROM ticket_search WHERE ticket_search MATCH ?
+        )
+    """
+    params = [match]
+    if after is not None:
+        sql += " WHERE score > ? OR (score = ? AND ticket_id > ?)"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY score, ticket_id LIMIT ?"
+    params.append(limit)
+    return run_sql_stmt(db_path, sql, stmt_type="select", params=tuple(params)) or []
@@ -0,0 +1,121 @@
+import json
+import time
+from threading import Lock
+from jira_manager.sql_manager import run_sql_stmt, transaction
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+
+
+class MetadataCache:
+    """
+    Editmeta field schemas persisted in tickets.db, keyed by
+    (server, project, issuetype), with a TTL and least-recently-used eviction.
+    Hits only record last_used in memory, it is written with the next put or
+    flush() so fetch workers never take the write lock on a hit.
+    """
+
+    def __init__(self, db_path, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        # (server, project, issuetype) -> last_used not yet written
+        self._touched = {}
+
+    def get(self, server, project, issuetype):
+        rows = run_sql_stmt(
+            self.db_path,
+            "SELECT fields_json, fetched_at FROM editmeta_cache WHERE server = ? AND project = ? AND issuetype = ?",
+            stmt_type="select",
+            params=(server, project, issuetype),
+        )
+        now = time.time()
+        if rows and now - rows[0][1] <= self.ttl_seconds:
+            with self._lock:
+                self._touched[(server, project, issuetype)] = now
+                self.hits += 1
+            return json.loads(rows[0][0])
+        with self._lock:
+            self.misses += 1
+            if rows:
+                self.expired += 1
+        return None
+
+    def put(self, server, project, issuetype, fields):
+        now = time.time()
+        run_sql_stmt(
+            self.db_path,
+            """INSERT INTO editmeta_cache (server, project, issuetype, fields_json, fetched_at, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (server, project, issuetype) DO UPDATE SET
+                fields_json = excluded.fields_json,
+                fetched_at = excluded.fetched_at,
+                last_used = excluded.last_used""",
+            stmt_type="insert",
+            params=(server, project, issuetype, json.dumps(fields), now, now),
+        )
+        self.evict()
+
+    def flush(self):
+        """
+        Writes the last_used times recorded by get() since the last flush.
+        """
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        with transaction(self.db_path) as conn:
+            conn.executemany(
+                "UPDATE editmeta_cache SET last_used = MAX(last_used, ?) WHERE server = ? AND project = ? AND issuetype = ?",
+                ((last_used, *entry) for entry, last_used in touched.items()),
+            )
+
+    def evict(self):
+        # Evict by up to date last_used values
+        self.flush()
+        count = run_sql_stmt(self.db_path, "SELECT COUNT(*) FROM editmeta_cache", stmt_type="select")
+        overflow = (count[0][0] if count else 0) - self.max_entries
+        if overflow > 0:
+            run_sql_stmt(
+                self.db_path,
+                """DELETE FROM editmeta_cache WHERE rowid IN (
+                    SELECT rowid FROM editmeta_cache ORDER BY last_used ASC LIMIT ?
+                )""",
+                stmt_type="delete",
+                params=(overflow,),
+            )
+            with self._lock:
+                self.evictions += overflow
+
+    def clear(self):
+        with self._lock:
+            self._touched = {}
+        run_sql_stmt(self.db_path, "DELETE FROM editmeta_cache", stmt_type="delete")
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_caches = {}
+_caches_lock = Lock()
+
+
+def get_metadata_cache(db_path):
+    # One cache per database so counters cover the whole session
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = MetadataCache(db_path)
+        return _caches[db_path]
@@ -0,0 +1,245 @@
+from jira_manager.sql_manager import transaction, content_hash, split_ticket_key
+from jira_manager.sql import (
+    receipts_table,
+    tickets_table,
+    fields_table,
+    fields_ticket_field_index,
+    editmeta_cache_table,
+    search_tasks_table,
+    search_checkpoints_table,
+    saved_queries_table,
+    search_tasks_lookup_index,
+    editmeta_cache_last_used_index,
+    receipts_created_at_index,
+    allowed_values_table,
+    field_definitions_table,
+    ticket_fields_table,
+    fields_view,
+    ticket_payloads_table,
+    ticket_search_table,
+    ticket_search_delete_trigger,
+    tickets_project_key_column,
+    tickets_issue_number_column,
+    tickets_project_number_index,
+    tickets_card_columns,
+    ticket_counts_table,
+    ticket_counts_insert_trigger,
+    ticket_counts_delete_trigger,
+    ticket_counts_update_trigger,
+    saved_query_results_table,
+    saved_queries_results_at_column,
+    page_blocks_table,
+    page_blocks_last_id_index,
+    page_blocks_insert_trigger,
+    page_blocks_delete_trigger,
+)
+from jira_manager.payload_store import decode_payload
+from jira_manager.local_search import build_search_document, build_card_summary
+
+
+def create_base_tables(conn):
+    # IF NOT EXISTS so databases created before migrations are adopted as-is
+    for ddl in (
+        tickets_table,
+        fields_table,
+        receipts_table,
+        editmeta_cache_table,
+        search_tasks_table,
+        search_checkpoints_table,
+        saved_queries_table,
+    ):
+        conn.execute(ddl)
+
+
+def add_fields_unique_index(conn):
+    # Older versions could store a field twice, keep the newest row
+    conn.execute(
+        """
+        DELETE FROM fields WHERE id NOT IN (
+            SELECT MAX(id) FROM fields GROUP BY ticket_id, field_key
+        );
+    """
+    )
+    conn.execute(fields_ticket_field_index)
+
+
+def add_lookup_indexes(conn):
+    # fields(ticket_id) lookups and cascading deletes use the unique index
+    conn.execute(search_tasks_lookup_index)
+    conn.execute(editmeta_cache_last_used_index)
+    conn.execute(receipts_created_at_index)
+
+
+def normalize_fields(conn):
+    """
+    Splits fields into per-(project, issuetype) field_definitions, shared
+    allowed_values blobs and slim ticket_fields rows, leaving a fields view.
+    """
+    conn.execute(allowed_values_table)
+    conn.execute(field_definitions_table)
+    conn.execute(ticket_fields_table)
+    is_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fields'"
+    ).fetchone()
+    if is_table:
+        conn.create_function("content_hash", 1, content_hash, deterministic=True)
+        # The issuetype of stored rows is unknown, the next sync fills it in
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO allowed_values (hash, values_json)
+            SELECT content_hash(COALESCE(allowed_values, '[]')), COALESCE(allowed_values, '[]')
+            FROM fields GROUP BY allowed_values;
+        """
+        )
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO field_definitions (
+                project, issuetype, field_key, field_name, field_type,
+                widget_type, is_editable, allowed_values_hash
+            )
+            SELECT
+                SUBSTR(t.key, 1, INSTR(t.key, '-') - 1), '', f.field_key, f.field_name,
+                f.field_type, f.widget_type, f.is_editable,
+                content_hash(COALESCE(f.allowed_values, '[]'))
+            FROM fields f JOIN tickets t ON t.ticket_id = f.ticket_id
+            ORDER BY f.id DESC;
+        """
+        )
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO ticket_fields (ticket_id, field_def_id, current_value)
+            SELECT f.ticket_id, d.field_def_id, f.current_value
+            FROM fields f
+            JOIN tickets t ON t.ticket_id = f.ticket_id
+            JOIN field_definitions d
+                ON d.project = SUBSTR(t.key, 1, INSTR(t.key, '-') - 1)
+                AND d.issuetype = ''
+                AND d.field_key = f.field_key;
+        """
+        )
+        conn.execute("DROP TABLE fields")
+    conn.execute(fields_view)
+
+
+def add_ticket_payloads(conn):
+    conn.execute(ticket_payloads_table)
+
+
+def add_ticket_search(conn):
+    conn.execute(ticket_search_table)
+    conn.execute(ticket_search_delete_trigger)
+    # Backfill from the stored payloads, older tickets are indexed by key only
+    rows = conn.execute(
+        """
+        SELECT t.ticket_id, t.key, p.codec, p.payload
+        FROM tickets t LEFT JOIN ticket_payloads p ON p.ticket_id = t.ticket_id
+    """
+    ).fetchall()
+    documents = []
+    for ticket_id, key, codec, payload in rows:
+        if payload is not None:
+            documents.append((ticket_id, *build_search_document(decode_payload(codec, payload))))
+        else:
+            documents.append((ticket_id, key, "", "", ""))
+    conn.executemany(
+        "INSERT INTO ticket_search (rowid, key, summary, description, field_text) VALUES (?, ?, ?, ?, ?)",
+        documents,
+    )
+
+
+def add_ticket_sort_key(conn):
+    conn.execute(tickets_project_key_column)
+    conn.execute(tickets_issue_number_column)
+    rows = conn.execute("SELECT ticket_id, key FROM tickets").fetchall()
+    conn.executemany(
+        "UPDATE tickets SET project_key = ?, issue_number = ? WHERE ticket_id = ?",
+        [(*split_ticket_key(key), ticket_id) for ticket_id, key in rows],
+    )
+    conn.execute(tickets_project_number_index)
+
+
+def add_ticket_card_columns(conn):
+    for ddl in tickets_card_columns:
+        conn.execute(ddl)
+    rows = conn.execute(
+        """
+        SELECT t.ticket_id, p.codec, p.payload
+        FROM tickets t JOIN ticket_payloads p ON p.ticket_id = t.ticket_id
+    """
+    ).fetchall()
+    conn.executemany(
+        "UPDATE tickets SET summary = ?, status = ?, assignee = ?, priority = ?, updated = ? WHERE ticket_id = ?",
+        [
+            (*build_card_summary(decode_payload(codec, payload)), ticket_id)
+            for ticket_id, codec, payload in rows
+        ],
+    )
+
+
+def add_ticket_counts(conn):
+    conn.execute(ticket_counts_table)
+    conn.execute(
+        """
+        INSERT INTO ticket_counts (project_key, ticket_count)
+        SELECT COALESCE(project_key, ''), COUNT(*) FROM tickets GROUP BY COALESCE(project_key, '')
+        UNION ALL
+        SELECT '*', COUNT(*) FROM tickets;
+    """
+    )
+    conn.execute(ticket_counts_insert_trigger)
+    conn.execute(ticket_counts_delete_trigger)
+    conn.execute(ticket_counts_update_trigger)
+
+
+def add_page_blocks(conn):
+    # Filled lazily by page_index.load_page_blocks
+    conn.execute(page_blocks_table)
+    conn.execute(page_blocks_last_id_index)
+    conn.execute(page_blocks_insert_trigger)
+    conn.execute(page_blocks_delete_trigger)
+
+
+def add_saved_query_results(conn):
+    conn.execute(saved_query_results_table)
+    conn.execute(saved_queries_results_at_column)
+
+
+# Append only: a database at user_version N has run the first N migrations
+MIGRATIONS = [
+    create_base_tables,
+    add_fields_unique_index,
+    add_lookup_indexes,
+    normalize_fields,
+    add_ticket_payloads,
+    add_ticket_search,
+    add_ticket_sort_key,
+    add_ticket_card_columns,
+    add_ticket_counts,
+    add_page_blocks,
+    add_saved_query_results,
+]
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path):
+    """
+    Brings db_path up to the latest schema. Each migration commits together
+    with its user_version bump, so an interrupted upgrade resumes cleanly.
+    Returns the resulting schema version.
+    """
+    for version, migration in enumerate(MIGRATIONS, start=1):
+        with transaction(db_path) as conn:
+            # Re-read inside the write lock in case another process migrated
+            if get_schema_version(conn) >= version:
+                continue
+            print(f"Applying schema migration {version}: {migration.__name__}")
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+    with transaction(db_path) as conn:
+        current = get_schema_version(conn)
+    if current > len(MIGRATIONS):
+        print(f"WARNING: database schema {current} is newer than this app ({len(MIGRATIONS)}).")
+    return current
@@ -0,0 +1,301 @@
+from bisect import bisect_right
+from math import ceil
+from threading import Lock
+from jira_manager.sql_manager import transaction, get_ticket_count, run_sql_stmt, TOTAL_COUNT_KEY
+
+# Tickets per board page, newest ticket_id first. Stored page_blocks use the
+# same size but count from the oldest ticket.
+PAGE_SIZE = 50
+
+
+def rebuild_page_blocks(db_path, from_block=1):
+    """
+    Recomputes the stored (first_id, last_id) of every full block from
+    from_block on with one ROW_NUMBER() pass that only returns each block's
+    first and last row. Blocks before from_block are kept and used as the
+    starting cursor.
+    """
+    with transaction(db_path) as conn:
+        after_id = None
+        if from_block > 1:
+            row = conn.execute(
+                "SELECT last_id FROM page_blocks WHERE block = ?", (from_block - 1,)
+            ).fetchone()
+            if row is None:
+                from_block = 1
+            else:
+                after_id = row[0]
+        conn.execute("DELETE FROM page_blocks WHERE block >= ?", (from_block,))
+        rows = conn.execute(
+            """
+            SELECT rn, ticket_id FROM (
+                SELECT ticket_id, ROW_NUMBER() OVER (ORDER BY ticket_id) AS rn
+                FROM tickets
+                WHERE ? IS NULL OR ticket_id > ?
+            )
+            WHERE rn % ? IN (0, 1)
+            ORDER BY rn
+        """,
+            (after_id, after_id, PAGE_SIZE),
+        ).fetchall()
+        blocks = {}
+        for rn, ticket_id in rows:
+            block = from_block + (rn - 1) // PAGE_SIZE
+            first_id, _ = blocks.get(block, (ticket_id, None))
+            blocks[block] = (first_id, ticket_id)
+        # The partial tail block changes with every insert, it isn't stored
+        if rows and rows[-1][0] % PAGE_SIZE:
+            blocks.pop(from_block + (rows[-1][0] - 1) // PAGE_SIZE)
+        conn.executemany(
+            "INSERT INTO page_blocks (block, first_id, last_id) VALUES (?, ?, ?)",
+            ((block, first_id, last_id) for block, (first_id, last_id) in blocks.items()),
+        )
+    return blocks
+
+
+def load_page_blocks(db_path):
+    """
+    Returns {block: (first_id, last_id)} for every full block, recomputing
+    only the tail the page_blocks triggers dropped since it was stored.
+    """
+    with transaction(db_path) as conn:
+        rows = conn.execute(
+            "SELECT block, first_id, last_id FROM page_blocks ORDER BY block"
+        ).fetchall()
+        blocks = {block: (first_id, last_id) for block, first_id, last_id in rows}
+        # Stored blocks are always a prefix, the triggers only ever drop a tail
+        full_blocks = get_ticket_count(db_path) // PAGE_SIZE
+        if len(blocks) < full_blocks:
+            print(f"Rebuilding page index from block {len(blocks) + 1} of {full_blocks}")
+            blocks.update(rebuild_page_blocks(db_path, len(blocks) + 1))
+    return blocks
+
+
+def load_page_bounds(db_path):
+    """
+    Returns {page: (first_id, last_id)} for every board page, newest first,
+    read off the stored blocks.
+    """
+    with transaction(db_path) as conn:
+        blocks = load_page_blocks(db_path)
+        total = get_ticket_count(db_path)
+
+        def ticket_at_rank(rank):
+            # rank 1 is the oldest ticket, found with an offset below PAGE_SIZE
+            block, offset = divmod(rank - 1, PAGE_SIZE)
+            if block + 1 not in blocks:
+                row = conn.execute(
+                    "SELECT ticket_id FROM tickets ORDER BY ticket_id DESC LIMIT 1 OFFSET ?",
+                    (total - rank,),
+                ).fetchone()
+            elif offset == 0:
+                return blocks[block + 1][0]
+            elif offset == PAGE_SIZE - 1:
+                return blocks[block + 1][1]
+            else:
+                row = conn.execute(
+                    "SELECT ticket_id FROM tickets WHERE ticket_id >= ? ORDER BY ticket_id LIMIT 1 OFFSET ?",
+                    (blocks[block + 1][0], offset),
+                ).fetchone()
+            return row[0] if row else None
+
+        bounds = {}
+        for page in range(1, ceil(total / PAGE_SIZE) + 1):
+            first_rank = total - (page - 1) * PAGE_SIZE
+            last_rank = max(1, first_rank - PAGE_SIZE + 1)
+            bounds[page] = (ticket_at_rank(first_rank), ticket_at_rank(last_rank))
+    return bounds
+
+
+class TicketRankIndex:
+    """
+    Fenwick tree over ticket_id ranges holding up to PAGE_SIZE tickets each,
+    so the ticket at any board position, and the position of any ticket, is
+    found in O(log n) plus one lookup within a range. Built from the stored
+    page_blocks and ticket_counts, then kept current by the DatabaseWriter
+    (add) and the delete paths (remove). Ranges are only merged again by
+    the next build, so deletes never grow the tree.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # starts[i] is the lowest ticket_id range i + 1 can hold
+        self.starts = []
+        self.counts = [0]
+        self.tree = [0]
+        self.total = 0
+        self.max_id = 0
+        self.changes = 0
+        self.synced_changes = 0
+        self.ready = False
+        self._lock = Lock()
+
+    def build(self):
+        with transaction(self.db_path) as conn:
+            blocks = load_page_blocks(self.db_path)
+            row = conn.execute(
+                "SELECT ticket_count FROM ticket_counts WHERE project_key = ?", (TOTAL_COUNT_KEY,)
+            ).fetchone()
+            total = row[0] if row else 0
+            max_id = conn.execute("SELECT COALESCE(MAX(ticket_id), 0) FROM tickets").fetchone()[0]
+        starts = [first_id for _, (first_id, _) in sorted(blocks.items())]
+        counts = [0] + [PAGE_SIZE] * len(starts)
+        # Tickets past the last full block share one open range
+        starts.append(blocks[len(blocks)][1] + 1 if blocks else 1)
+        counts.append(total - PAGE_SIZE * len(blocks))
+        with self._lock:
+            self.starts = starts
+            self.counts = counts
+            self._rebuild_tree()
+            self.total = total
+            self.max_id = max_id
+            self.changes += 1
+            self.ready = True
+        return self
+
+    def sync(self):
+        """
+        Returns True if tickets were added or removed since the last call.
+        Rebuilds from the stored blocks if the stored ticket count disagrees,
+        e.g. after tickets were written outside the DatabaseWriter.
+        """
+        if self.ready and get_ticket_count(self.db_path) != self.total:
+            print("Rank index out of date, rebuilding.")
+            self.build()
+        with self._lock:
+            changed = self.changes != self.synced_changes
+            self.synced_changes = self.changes
+        return changed
+
+    def add(self, ticket_ids):
+        """
+        Counts newly committed tickets. ticket_ids are never reused, so ids
+        at or below the highest one seen are already counted.
+        """
+        with self._lock:
+            if not self.ready:
+                return
+            for ticket_id in sorted(ticket_ids):
+                if ticket_id <= self.max_id:
+                    continue
+                self.max_id = ticket_id
+                if self.counts[-1] >= PAGE_SIZE:
+                    self._append_range(ticket_id)
+                self._update(len(self.starts), 1)
+            self.changes += 1
+
+    def remove(self, ticket_ids):
+        # Called with the ticket_ids a delete actually removed
+        with self._lock:
+            if not self.ready:
+                return
+            for ticket_id in ticket_ids:
+                index = bisect_right(self.starts, ticket_id)
+                if index and self.counts[index]:
+                    self._update(index, -1)
+            self.changes += 1
+
+    def _rebuild_tree(self):
+        size = len(self.counts) - 1
+        tree = list(self.counts)
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self.tree = tree
+
+    def _append_range(self, start):
+        self.starts.append(start)
+        self.counts.append(0)
+        # A new last node covers the ranges below it down to its lowest bit
+        index = len(self.counts) - 1
+        self.tree.append(self._prefix(index - 1) - self._prefix(index - (index & -index)))
+
+    def _update(self, index, delta):
+        self.counts[index] += delta
+        self.total += delta
+        size = len(self.tree) - 1
+        while index <= size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def _prefix(self, index):
+        # Number of stored tickets in ranges 1..index
+        count = 0
+        while index > 0:
+            count += self.tree[index]
+            index -= index & -index
+        return count
+
+    def _find(self, rank):
+        # Smallest range index with prefix count >= rank
+        size = len(self.tree) - 1
+        position = 0
+        step = 1 << size.bit_length()
+        while step:
+            following = position + step
+            if following <= size and self.tree[following] < rank:
+                position = following
+                rank -= self.tree[following]
+            step >>= 1
+        return position + 1, rank
+
+    def ticket_at(self, position):
+        """
+        Returns the ticket_id at 1-based position on the board (newest
+        first), or None past the end.
+        """
+        with self._lock:
+            if not 1 <= position <= self.total:
+                return None
+            index, rank = self._find(self.total - position + 1)
+            start = self.starts[index - 1]
+        rows = run_sql_stmt(
+            self.db_path,
+            "SELECT ticket_id FROM tickets WHERE ticket_id >= ? ORDER BY ticket_id LIMIT 1 OFFSET ?",
+            stmt_type="select",
+            params=(start, rank - 1),
+        )
+        return rows[0][0] if rows else None
+
+    def position_of(self, ticket_id):
+        """
+        Returns the 1-based board position of a stored ticket_id, or None.
+        """
+        with self._lock:
+            index = bisect_right(self.starts, ticket_id)
+            if not index:
+                return None
+            start = self.starts[index - 1]
+            before = self._prefix(index - 1)
+            total = self.total
+        rows = run_sql_stmt(
+            self.db_path,
+            "SELECT COUNT(*), MAX(ticket_id = ?) FROM tickets WHERE ticket_id BETWEEN ? AND ?",
+            stmt_type="select",
+            params=(ticket_id, start, ticket_id),
+        )
+        if not rows or not rows[0][1]:
+            return None
+        count = rows[0][0]
+        return total - (before + count) + 1
+
+    def page_start(self, page):
+        # First (highest) ticket_id on a board page
+        return self.ticket_at((page - 1) * PAGE_SIZE + 1)
+
+    def page_of(self, ticket_id):
+        position = self.position_of(ticket_id)
+        return None if position is None else (position - 1) // PAGE_SIZE + 1
+
+
+_rank_indexes = {}
+_rank_indexes_lock = Lock()
+
+
+def get_rank_index(db_path):
+    # One index per database, built by the first caller
+    with _rank_indexes_lock:
+        if db_path not in _rank_indexes:
+            _rank_indexes[db_path] = TicketRankIndex(db_path)
+        return _rank_indexes[db_path]
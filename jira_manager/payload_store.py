@@ -0,0 +1,73 @@
+import hashlib
+import json
+import zlib
+from jira_manager.sql_manager import run_sql_stmt
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def encode_payload(issue):
+    """
+    Serializes a raw Jira issue for ticket_payloads.
+    Returns (codec, content_hash, raw_size, blob), using zstd when the
+    zstandard package is installed and zlib otherwise.
+    """
+    # Canonical JSON so an unchanged issue always hashes the same
+    raw = json.dumps(issue, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    content_hash = hashlib.sha256(raw).hexdigest()
+    if zstandard is not None:
+        return "zstd", content_hash, len(raw), zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return "zlib", content_hash, len(raw), zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decode_payload(codec, blob):
+    if codec == "zlib":
+        raw = zlib.decompress(blob)
+    elif codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This payload is zstd compressed, install zstandard to read it.")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raise ValueError(f"Unsupported payload codec: {codec}")
+    return json.loads(raw)
+
+
+def load_ticket_payload(db_path, ticket_key):
+    """
+    Returns the stored raw issue for ticket_key, or None if it has none.
+    Only call this where the full issue is needed, e.g. a detail view or export.
+    """
+    rows = run_sql_stmt(
+        db_path,
+        """
+        SELECT p.codec, p.payload FROM ticket_payloads p
+        JOIN tickets t ON t.ticket_id = p.ticket_id
+        WHERE t.key = ?
+    """,
+        stmt_type="select",
+        params=(ticket_key,),
+    )
+    if not rows:
+        return None
+    return decode_payload(*rows[0])
+
+
+def get_payload_stats(db_path):
+    rows = run_sql_stmt(
+        db_path,
+        "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM ticket_payloads",
+        stmt_type="select",
+    )
+    count, raw_size, stored_size = rows[0] if rows else (0, 0, 0)
+    return {
+        "payloads": count,
+        "raw_bytes": raw_size,
+        "stored_bytes": stored_size,
+        "ratio": round(stored_size / raw_size, 3) if raw_size else 0.0,
+    }
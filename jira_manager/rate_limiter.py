@@ -0,0 +1,140 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Condition, Lock
+from urllib.parse import urlparse
+
+# Jira Cloud answers 429 when throttling and 503 when overloaded
+RETRY_STATUSES = {429, 503}
+DEFAULT_RATE_PER_SECOND = 20.0
+DEFAULT_BURST = 20
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 30.0
+
+
+def parse_retry_after(value):
+    """
+    Returns the Retry-After header as seconds to wait, or None if absent.
+    The header is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def compute_backoff(attempt, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_CAP_SECONDS):
+    # Full jitter keeps throttled workers from retrying in lockstep
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second=DEFAULT_RATE_PER_SECOND, capacity=DEFAULT_BURST):
+        self.rate = float(rate_per_second)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit: grows by roughly one slot per window of successful
+    requests and halves whenever the server throttles us.
+    """
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._cond = Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class ServerThrottle:
+    def __init__(self, max_concurrency, rate_per_second, burst):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.blocked_until = 0.0
+        self._lock = Lock()
+
+    def acquire(self):
+        # A Retry-After from any worker pauses every worker on this server
+        while True:
+            with self._lock:
+                wait = self.blocked_until - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        self.bucket.acquire()
+        self.limiter.acquire()
+
+    def release(self, throttled=False):
+        self.limiter.release(throttled)
+
+    def block_for(self, seconds):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class RequestScheduler:
+    """
+    Hands out one ServerThrottle per Jira host, shared by every worker thread.
+    """
+
+    def __init__(self, max_concurrency, rate_per_second=DEFAULT_RATE_PER_SECOND, burst=DEFAULT_BURST):
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._throttles = {}
+        self._lock = Lock()
+
+    def for_url(self, url):
+        server = urlparse(url).netloc
+        with self._lock:
+            if server not in self._throttles:
+                self._throttles[server] = ServerThrottle(
+                    self.max_concurrency, self.rate_per_second, self.burst
+                )
+            return self._throttles[server]
+
+    def get_limits(self):
+        with self._lock:
+            return {server: round(t.limiter.limit, 2) for server, t in self._throttles.items()}
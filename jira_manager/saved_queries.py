@@ -0,0 +1,132 @@
+import datetime
+from threading import Lock
+from jira_manager.sql_manager import run_sql_stmt, transaction
+from jira_manager.jql_planner import and_clause, parse_jira_datetime, format_jql_date
+
+# Extra look-back on every refresh to cover clock skew between us and Jira
+WATERMARK_MARGIN_MINUTES = 5
+
+
+def build_delta_jql(jql, watermark, jira_timezone=datetime.timezone.utc):
+    """
+    Narrows jql to issues updated since the watermark. The cutoff is an
+    absolute date in jira_timezone, the timezone Jira reads JQL dates in,
+    so a resumed search still covers the same window.
+    """
+    if watermark is None:
+        return jql
+    cutoff = watermark - datetime.timedelta(minutes=WATERMARK_MARGIN_MINUTES)
+    return and_clause(jql, f'updated >= "{format_jql_date(cutoff, jira_timezone)}"')
+
+
+def last_results(db_path, server, jql):
+    """
+    Returns (query_id, results_at) for the last run of jql against server
+    that recorded its whole result in saved_query_results, or None.
+    """
+    rows = run_sql_stmt(
+        db_path,
+        "SELECT query_id, results_at FROM saved_queries WHERE server = ? AND jql = ?",
+        stmt_type="select",
+        params=(server, jql),
+    )
+    if not rows or not rows[0][1]:
+        return None
+    return rows[0][0], datetime.datetime.fromisoformat(rows[0][1])
+
+
+class SavedQuery:
+    """
+    A JQL search remembered per server with the highest `updated` timestamp
+    seen, so refreshes only fetch issues changed since the last run.
+    """
+
+    def __init__(self, db_path, query_id, server, jql, watermark=None):
+        self.db_path = db_path
+        self.query_id = query_id
+        self.server = server
+        self.jql = jql
+        self.watermark = watermark
+        self.latest_seen = None
+        self.seen_keys = set()
+        self._lock = Lock()
+
+    @classmethod
+    def open(cls, db_path, server, jql):
+        run_sql_stmt(
+            db_path,
+            "INSERT OR IGNORE INTO saved_queries (server, jql) VALUES (?, ?)",
+            stmt_type="insert",
+            params=(server, jql),
+        )
+        rows = run_sql_stmt(
+            db_path,
+            "SELECT query_id, watermark FROM saved_queries WHERE server = ? AND jql = ?",
+            stmt_type="select",
+            params=(server, jql),
+        )
+        query_id, watermark = rows[0]
+        if watermark:
+            watermark = datetime.datetime.fromisoformat(watermark)
+        return cls(db_path, query_id, server, jql, watermark or None)
+
+    def delta_jql(self, jira_timezone=datetime.timezone.utc):
+        return build_delta_jql(self.jql, self.watermark, jira_timezone)
+
+    def observe(self, issues):
+        # Called by ingest workers after each committed page
+        page_latest = None
+        keys = set()
+        for issue in issues:
+            keys.add(str(issue.get("key", "")))
+            updated = parse_jira_datetime((issue.get("fields") or {}).get("updated"))
+            if updated is not None and (page_latest is None or updated > page_latest):
+                page_latest = updated
+        with self._lock:
+            self.seen_keys.update(keys)
+            if page_latest is None:
+                return
+            if self.latest_seen is None or page_latest > self.latest_seen:
+                self.latest_seen = page_latest
+
+    def commit(self, full_run=False, result_keys=None):
+        """
+        Advances the watermark once the whole search has been stored and
+        records the tickets it returned. A full run replaces the recorded
+        results. A delta run only adds to them since it can't see tickets
+        that stopped matching, unless result_keys, every key the full JQL
+        matches now, is given to replace them with.
+        """
+        with self._lock:
+            latest = self.latest_seen
+            seen_keys = list(self.seen_keys)
+        if latest is not None and (self.watermark is None or latest > self.watermark):
+            self.watermark = latest.astimezone(datetime.timezone.utc)
+        now = datetime.datetime.now().isoformat()
+        with transaction(self.db_path) as conn:
+            complete = full_run
+            if full_run or result_keys is not None:
+                conn.execute("DELETE FROM saved_query_results WHERE query_id = ?", (self.query_id,))
+            if result_keys is not None and not full_run:
+                seen_keys = list(set(result_keys))
+            conn.executemany(
+                "INSERT OR IGNORE INTO saved_query_results (query_id, ticket_id) SELECT ?, ticket_id FROM tickets WHERE key = ?",
+                ((self.query_id, key) for key in seen_keys),
+            )
+            if result_keys is not None and not full_run:
+                # Only answerable locally if every matching ticket is stored
+                stored = conn.execute(
+                    "SELECT COUNT(*) FROM saved_query_results WHERE query_id = ?", (self.query_id,)
+                ).fetchone()[0]
+                complete = stored == len(seen_keys)
+            conn.execute(
+                "UPDATE saved_queries SET watermark = ?, last_run_at = ?, results_at = CASE WHEN ? THEN results_at ELSE ? END WHERE query_id = ?",
+                (
+                    self.watermark.isoformat() if self.watermark else None,
+                    now,
+                    # A plain delta run leaves the recorded results as they were
+                    not full_run and result_keys is None,
+                    now if complete else None,
+                    self.query_id,
+                ),
+            )
@@ -25,3 +25,244 @@ fields_table = """CREATE TABLE IF NOT EXISTS fields (
     FOREIGN KEY (ticket_id) REFERENCES tickets(ticket_id) ON DELETE CASCADE
 );
 """
+
+# Conflict target for the field upserts, one row per ticket and field
+fields_ticket_field_index = """CREATE UNIQUE INDEX IF NOT EXISTS idx_fields_ticket_field
+    ON fields (ticket_id, field_key);
+"""
+
+editmeta_cache_table = """CREATE TABLE IF NOT EXISTS editmeta_cache (
+    server TEXT NOT NULL,
+    project TEXT NOT NULL,
+    issuetype TEXT NOT NULL,
+    fields_json TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (server, project, issuetype)
+);
+"""
+
+search_tasks_table = """CREATE TABLE IF NOT EXISTS search_tasks (
+    task_id TEXT PRIMARY KEY,
+    server TEXT NOT NULL,
+    jql TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+search_checkpoints_table = """CREATE TABLE IF NOT EXISTS search_checkpoints (
+    task_id TEXT NOT NULL,
+    slice_index INTEGER NOT NULL,
+    slice_jql TEXT NOT NULL,
+    next_page_token TEXT,
+    pages_committed INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running',
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (task_id, slice_index),
+    FOREIGN KEY (task_id) REFERENCES search_tasks(task_id) ON DELETE CASCADE
+);
+"""
+
+saved_queries_table = """CREATE TABLE IF NOT EXISTS saved_queries (
+    query_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    server TEXT NOT NULL,
+    jql TEXT NOT NULL,
+    watermark TEXT,
+    last_run_at TEXT,
+    UNIQUE (server, jql)
+);
+"""
+
+search_tasks_lookup_index = """CREATE INDEX IF NOT EXISTS idx_search_tasks_lookup
+    ON search_tasks (server, jql, status, created_at);
+"""
+
+editmeta_cache_last_used_index = """CREATE INDEX IF NOT EXISTS idx_editmeta_cache_last_used
+    ON editmeta_cache (last_used);
+"""
+
+receipts_created_at_index = """CREATE INDEX IF NOT EXISTS idx_receipts_created_at
+    ON receipts (created_at);
+"""
+
+# Option lists are stored once per distinct JSON, addressed by its hash
+allowed_values_table = """CREATE TABLE IF NOT EXISTS allowed_values (
+    hash TEXT PRIMARY KEY,
+    values_json TEXT NOT NULL
+);
+"""
+
+field_definitions_table = """CREATE TABLE IF NOT EXISTS field_definitions (
+    field_def_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    issuetype TEXT NOT NULL,
+    field_key TEXT NOT NULL,
+    field_name TEXT,
+    field_type TEXT,
+    widget_type TEXT,
+    is_editable TEXT,
+    allowed_values_hash TEXT,
+    UNIQUE (project, issuetype, field_key),
+    FOREIGN KEY (allowed_values_hash) REFERENCES allowed_values(hash)
+);
+"""
+
+ticket_fields_table = """CREATE TABLE IF NOT EXISTS ticket_fields (
+    ticket_id INTEGER NOT NULL,
+    field_def_id INTEGER NOT NULL,
+    current_value TEXT,
+    PRIMARY KEY (ticket_id, field_def_id),
+    FOREIGN KEY (ticket_id) REFERENCES tickets(ticket_id) ON DELETE CASCADE,
+    FOREIGN KEY (field_def_id) REFERENCES field_definitions(field_def_id)
+) WITHOUT ROWID;
+"""
+
+# Read-only stand-in for the old denormalized fields table
+fields_view = """CREATE VIEW IF NOT EXISTS fields AS
+SELECT
+    tf.ticket_id,
+    fd.field_key,
+    fd.field_name,
+    fd.field_type,
+    fd.widget_type,
+    fd.is_editable,
+    av.values_json AS allowed_values,
+    tf.current_value
+FROM ticket_fields tf
+JOIN field_definitions fd ON fd.field_def_id = tf.field_def_id
+LEFT JOIN allowed_values av ON av.hash = fd.allowed_values_hash;
+"""
+
+ticket_payloads_table = """CREATE TABLE IF NOT EXISTS ticket_payloads (
+    ticket_id INTEGER PRIMARY KEY,
+    codec TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (ticket_id) REFERENCES tickets(ticket_id) ON DELETE CASCADE
+);
+"""
+
+# Sort key split out of the ticket key, so BENCH-12 sorts before BENCH-100
+tickets_project_key_column = """ALTER TABLE tickets ADD COLUMN project_key TEXT;
+"""
+
+tickets_issue_number_column = """ALTER TABLE tickets ADD COLUMN issue_number INTEGER;
+"""
+
+# Key order, which ORDER BY key sorts by across and within projects
+tickets_project_number_index = """CREATE INDEX IF NOT EXISTS idx_tickets_project_number
+    ON tickets (project_key, issue_number);
+"""
+
+# What a ticket card shows, copied from the raw issue on ingest so a page
+# of cards is a single query on tickets
+tickets_card_columns = (
+    "ALTER TABLE tickets ADD COLUMN summary TEXT;",
+    "ALTER TABLE tickets ADD COLUMN status TEXT;",
+    "ALTER TABLE tickets ADD COLUMN assignee TEXT;",
+    "ALTER TABLE tickets ADD COLUMN priority TEXT;",
+    "ALTER TABLE tickets ADD COLUMN updated TEXT;",
+)
+
+# Ticket counts kept by triggers, one row per project_key plus the total
+# under TOTAL_COUNT_KEY ('*' never appears in a Jira project key)
+ticket_counts_table = """CREATE TABLE IF NOT EXISTS ticket_counts (
+    project_key TEXT PRIMARY KEY,
+    ticket_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+ticket_counts_insert_trigger = """CREATE TRIGGER IF NOT EXISTS tickets_count_insert
+AFTER INSERT ON tickets
+BEGIN
+    INSERT INTO ticket_counts (project_key, ticket_count)
+    VALUES ('*', 1), (COALESCE(new.project_key, ''), 1)
+    ON CONFLICT (project_key) DO UPDATE SET ticket_count = ticket_count + 1;
+END;
+"""
+
+ticket_counts_delete_trigger = """CREATE TRIGGER IF NOT EXISTS tickets_count_delete
+AFTER DELETE ON tickets
+BEGIN
+    UPDATE ticket_counts SET ticket_count = ticket_count - 1
+    WHERE project_key IN ('*', COALESCE(old.project_key, ''));
+END;
+"""
+
+ticket_counts_update_trigger = """CREATE TRIGGER IF NOT EXISTS tickets_count_update
+AFTER UPDATE OF project_key ON tickets
+WHEN COALESCE(old.project_key, '') != COALESCE(new.project_key, '')
+BEGIN
+    UPDATE ticket_counts SET ticket_count = ticket_count - 1
+    WHERE project_key = COALESCE(old.project_key, '');
+    INSERT INTO ticket_counts (project_key, ticket_count)
+    VALUES (COALESCE(new.project_key, ''), 1)
+    ON CONFLICT (project_key) DO UPDATE SET ticket_count = ticket_count + 1;
+END;
+"""
+
+# Board page cursors, as fixed blocks of PAGE_SIZE tickets counted from the
+# oldest so a new (highest) ticket_id never shifts a stored block. Only
+# full blocks are stored, block 1 holds the lowest ticket_ids.
+page_blocks_table = """CREATE TABLE IF NOT EXISTS page_blocks (
+    block INTEGER PRIMARY KEY,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL
+);
+"""
+
+page_blocks_last_id_index = """CREATE INDEX IF NOT EXISTS idx_page_blocks_last_id
+    ON page_blocks (last_id);
+"""
+
+# Only blocks reaching past the changed ticket_id shift, which for the usual
+# insert of a new highest ticket_id is none
+page_blocks_insert_trigger = """CREATE TRIGGER IF NOT EXISTS tickets_page_blocks_insert
+AFTER INSERT ON tickets
+BEGIN
+    DELETE FROM page_blocks WHERE last_id >= new.ticket_id;
+END;
+"""
+
+page_blocks_delete_trigger = """CREATE TRIGGER IF NOT EXISTS tickets_page_blocks_delete
+AFTER DELETE ON tickets
+BEGIN
+    DELETE FROM page_blocks WHERE last_id >= old.ticket_id;
+END;
+"""
+
+# rowid is the ticket_id, rows are written on ingest and removed by trigger
+ticket_search_table = """CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search USING fts5(
+    key,
+    summary,
+    description,
+    field_text,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+ticket_search_delete_trigger = """CREATE TRIGGER IF NOT EXISTS tickets_search_delete
+AFTER DELETE ON tickets
+BEGIN
+    DELETE FROM ticket_search WHERE rowid = old.ticket_id;
+END;
+"""
+
+# Tickets returned by the latest runs of a saved query, so local JQL only
+# looks at tickets Jira actually returned for it
+saved_query_results_table = """CREATE TABLE IF NOT EXISTS saved_query_results (
+    query_id INTEGER NOT NULL,
+    ticket_id INTEGER NOT NULL,
+    PRIMARY KEY (query_id, ticket_id),
+    FOREIGN KEY (query_id) REFERENCES saved_queries(query_id) ON DELETE CASCADE,
+    FOREIGN KEY (ticket_id) REFERENCES tickets(ticket_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+"""
+
+# Set by full (non-delta) runs, which replace the recorded results
+saved_queries_results_at_column = """ALTER TABLE saved_queries ADD COLUMN results_at TEXT;"""
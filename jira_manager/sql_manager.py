@@ -1,16 +1,7 @@
-def create_receipts_table(db_path):
-    from jira_manager.sql import receipts_table
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute(receipts_table)
-        conn.commit()
-
 def insert_receipt(db_path, existing_tickets, added_tickets):
     import datetime, json
-    create_receipts_table(db_path)
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+    with transaction(db_path) as conn:
+        conn.execute(
             "INSERT INTO receipts (created_at, existing_tickets, added_tickets) VALUES (?, ?, ?)",
             (
                 datetime.datetime.now().isoformat(),
@@ -18,14 +9,11 @@ def insert_receipt(db_path, existing_tickets, added_tickets):
                 json.dumps(added_tickets)
             )
         )
-        conn.commit()
 
 def fetch_all_receipts(db_path):
-    create_receipts_table(db_path)
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT receipt_id, created_at, existing_tickets, added_tickets FROM receipts ORDER BY created_at DESC")
-        rows = cursor.fetchall()
+    rows = get_connection(db_path).execute(
+        "SELECT receipt_id, created_at, existing_tickets, added_tickets FROM receipts ORDER BY created_at DESC"
+    ).fetchall()
     import json
     return [
         {
@@ -36,7 +24,90 @@ def fetch_all_receipts(db_path):
         }
         for row in rows
     ]
+import datetime
+import hashlib
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+# One configured connection per (thread, database), reused for every query
+_local = threading.local()
+# name -> (num_params, func) available on every connection
+_sql_functions = {}
+
+
+def register_sql_function(name, num_params, func):
+    """
+    Makes a Python function callable from SQL on every connection, including
+    connections that are already open.
+    """
+    _sql_functions[name] = (num_params, func)
+
+
+def get_connection(db_path):
+    """
+    Returns the calling thread's connection to db_path, opening it and
+    applying the pragmas on first use.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+        _local.functions = {}
+    key = os.path.abspath(db_path)
+    conn = connections.get(key)
+    if conn is None:
+        # Autocommit mode, transactions are only opened by transaction()
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA foreign_keys = ON;")
+        # WAL keeps the database consistent at NORMAL, only the last
+        # commits can be lost on power failure
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        connections[key] = conn
+        _local.functions[key] = set()
+    registered = _local.functions[key]
+    if len(registered) != len(_sql_functions):
+        for name, (num_params, func) in list(_sql_functions.items()):
+            if name not in registered:
+                conn.create_function(name, num_params, func, deterministic=True)
+                registered.add(name)
+    return conn
+
+
+def close_connection(db_path):
+    connections = getattr(_local, "connections", None) or {}
+    conn = connections.pop(os.path.abspath(db_path), None)
+    getattr(_local, "functions", {}).pop(os.path.abspath(db_path), None)
+    if conn is not None:
+        conn.close()
+
+
+@contextmanager
+def transaction(db_path):
+    """
+    Runs the block in a single write transaction on this thread's connection,
+    committing on success and rolling back on error. Nested blocks join the
+    outer transaction.
+    """
+    conn = get_connection(db_path)
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    try:
+        conn.execute("COMMIT")
+    except BaseException:
+        # A failed COMMIT (e.g. SQLITE_BUSY or a deferred constraint) leaves
+        # the transaction open, which would swallow every later write
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
 
 # def insert_fields_into_db(db_path, ticket_id, field_rows):
 #     try:
@@ -131,11 +202,8 @@ def run_sql_stmt(
     stmt_type = stmt_type.lower() if stmt_type else ""
 
     try:
-        # Create a new connection for each call
-        conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode=WAL;")  # Enable WAL mode
-        conn.execute("PRAGMA foreign_keys = ON;")  # Enable foreign key constraints
-        cursor = conn.cursor()
+        # Writes outside transaction() autocommit on the thread's connection
+        cursor = get_connection(db_path).cursor()
 
         if stmt_type == "select":
             if not sql:
@@ -147,7 +215,6 @@ def run_sql_stmt(
             if not sql:
                 raise ValueError("INSERT operation requires an SQL query.")
             cursor.execute(sql, params or ())
-            conn.commit()
 
         elif stmt_type in {"update", "delete", "create", "drop", "alter"}:
             if not sql:
@@ -155,13 +222,11 @@ def run_sql_stmt(
                     f"{stmt_type.upper()} operation requires an SQL query."
                 )
             cursor.execute(sql, params or ())
-            conn.commit()
 
         else:
             raise ValueError(f"Unsupported statement type: {stmt_type}")
 
         cursor.close()
-        conn.close()
 
     except sqlite3.OperationalError as e:
         print(f"[SQL Error] {e}")
@@ -169,18 +234,24 @@ def run_sql_stmt(
     return items
 
 
-def batch_insert_tickets(db_path, tickets):
-    try:
-        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode=WAL;")
-        cursor = conn.cursor()
+def split_ticket_key(key):
+    """
+    Returns the (project_key, issue_number) sort key of a ticket key such as
+    "ABC-123", with issue_number None when the key has no number.
+    """
+    project_key, _, number = str(key).rpartition("-")
+    if not project_key or not number.isdigit():
+        return str(key), None
+    return project_key, int(number)
 
-        keys = [(ticket["key"],) for ticket in tickets]
-        cursor.executemany("INSERT INTO tickets (key) VALUES (?)", keys)
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+def batch_insert_tickets(db_path, tickets):
+    try:
+        rows = [(ticket["key"], *split_ticket_key(ticket["key"])) for ticket in tickets]
+        with transaction(db_path) as conn:
+            conn.executemany(
+                "INSERT INTO tickets (key, project_key, issue_number) VALUES (?, ?, ?)", rows
+            )
     except sqlite3.OperationalError as e:
         print(f"[SQL Error] {e}")
 
@@ -197,9 +268,7 @@ def table_exists(db_path, table_name):
         bool: True if the table exists, False otherwise.
     """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        cursor = get_connection(db_path).execute(
             """
             SELECT name FROM sqlite_master
             WHERE type='table' AND name=?
@@ -211,8 +280,6 @@ def table_exists(db_path, table_name):
     except sqlite3.Error as e:
         print(f"SQLite error: {e}")
         return False
-    finally:
-        conn.close()
 
 
 # def create_table(db_name: str, table_name: str, columns: dict):
@@ -228,18 +295,14 @@ def table_exists(db_path, table_name):
 
 
 def insert_into_table(db_name: str, table_name: str, data: dict):
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-
     columns = ", ".join(data.keys())
     placeholders = ", ".join(["?" for _ in data])
     values = tuple(data.values())
 
     sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
 
-    cursor.execute(sql, values)
-    conn.commit()
-    conn.close()
+    with transaction(db_name) as conn:
+        conn.execute(sql, values)
 
 
 # def read_from_table(db_name: str, table_name: str, filters: dict = None):
@@ -260,132 +323,304 @@ def insert_into_table(db_name: str, table_name: str, data: dict):
 #     return rows
 
 
-def add_column_to_table(
-    db_path, table_name, column_name, column_type="TEXT", default_value=None
-):
+def add_or_find_key_return_id(db_path: str, key: str) -> int:
+    print(f"{key=}")
+    try:
+        ticket_id = upsert_ticket_keys(db_path, [key]).get(str(key), 0)
+        print(f"Item {key} stored with ticket_id = {ticket_id}")
+        return ticket_id
+    except sqlite3.Error as e:
+        print(f"Issue adding {key} to database: {e}")
+        return 0
+
+
+# Rows per multi-row INSERT, capped further by SQLite's bound variable
+# limit (32766 since 3.32)
+UPSERT_CHUNK_SIZE = 500
+MAX_VARIABLES = 32000
+
+
+def content_hash(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+def insert_values_returning(conn, insert_sql, rows, suffix):
+    """
+    Runs insert_sql with multi-row VALUES for rows in as few statements as
+    the variable limit allows, returning the rows produced by suffix's
+    RETURNING clause.
+    """
+    if not rows:
+        return []
+    width = len(rows[0])
+    per_statement = max(1, min(UPSERT_CHUNK_SIZE, MAX_VARIABLES // width))
+    row_placeholder = "(" + ", ".join("?" for _ in range(width)) + ")"
+    returned = []
+    for start in range(0, len(rows), per_statement):
+        chunk = rows[start : start + per_statement]
+        placeholders = ", ".join(row_placeholder for _ in chunk)
+        returned += conn.execute(
+            f"{insert_sql} VALUES {placeholders} {suffix}",
+            [value for row in chunk for value in row],
+        ).fetchall()
+    return returned
+
+
+def upsert_ticket_keys(db_path, keys):
+    """
+    Inserts any missing ticket keys and returns {key: ticket_id} for all of them.
+    """
+    keys = list(dict.fromkeys(str(key) for key in keys))
+    with transaction(db_path) as conn:
+        # DO UPDATE (rather than DO NOTHING) so existing keys are returned too
+        rows = insert_values_returning(
+            conn,
+            "INSERT INTO tickets (key, project_key, issue_number)",
+            [(key, *split_ticket_key(key)) for key in keys],
+            "ON CONFLICT (key) DO UPDATE SET key = excluded.key RETURNING key, ticket_id",
+        )
+    return dict(rows)
+
+
+def delete_tickets(db_path, keys):
+    """
+    Deletes the tickets with the given keys in one transaction, returning
+    {key: ticket_id} for those that existed. Their fields, payloads and
+    search rows go by cascade and trigger, as do the counter and page
+    block updates. Callers pass the returned ids to the rank index.
+
+    Saved queries that returned any of them lose their watermark, so the
+    next run is a full refresh that can bring the deleted tickets back.
+    """
+    keys = list(dict.fromkeys(str(key) for key in keys))
+    per_statement = min(UPSERT_CHUNK_SIZE, MAX_VARIABLES)
+    deleted = []
+    with transaction(db_path) as conn:
+        for start in range(0, len(keys), per_statement):
+            chunk = keys[start : start + per_statement]
+            placeholders = ", ".join("?" for _ in chunk)
+            # Before the delete, which cascades the saved_query_results rows away
+            conn.execute(
+                f"""
+                UPDATE saved_queries SET watermark = NULL, results_at = NULL
+                WHERE query_id IN (
+                    SELECT r.query_id FROM saved_query_results r
+                    JOIN tickets t ON t.ticket_id = r.ticket_id
+                    WHERE t.key IN ({placeholders})
+                )
+            """,
+                chunk,
+            )
+            deleted += conn.execute(
+                f"DELETE FROM tickets WHERE key IN ({placeholders}) RETURNING key, ticket_id",
+                chunk,
+            ).fetchall()
+    return dict(deleted)
+
+
+def upsert_field_definitions(db_path, definitions):
+    """
+    Upserts {(project, issuetype, field_key): field_row} and their option
+    lists, returning {(project, issuetype, field_key): field_def_id}.
+    """
+    allowed_values = {}
+    rows = []
+    for (project, issuetype, field_key), field in definitions.items():
+        values_json = field["allowed_values"] or "[]"
+        values_hash = content_hash(values_json)
+        allowed_values[values_hash] = values_json
+        rows.append(
+            (
+                project,
+                issuetype,
+                field_key,
+                field["field_name"],
+                field["field_type"],
+                field["widget_type"],
+                field["is_editable"],
+                values_hash,
+            )
+        )
+    with transaction(db_path) as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO allowed_values (hash, values_json) VALUES (?, ?)",
+            allowed_values.items(),
+        )
+        returned = insert_values_returning(
+            conn,
+            """INSERT INTO field_definitions (
+                project,
+                issuetype,
+                field_key,
+                field_name,
+                field_type,
+                widget_type,
+                is_editable,
+                allowed_values_hash
+            )""",
+            rows,
+            """ON CONFLICT (project, issuetype, field_key) DO UPDATE SET
+                field_name = excluded.field_name,
+                field_type = excluded.field_type,
+                widget_type = excluded.widget_type,
+                is_editable = excluded.is_editable,
+                allowed_values_hash = excluded.allowed_values_hash
+            RETURNING project, issuetype, field_key, field_def_id""",
+        )
+    return {(project, issuetype, field_key): def_id for project, issuetype, field_key, def_id in returned}
+
+
+def upsert_ticket_page(db_path, tickets):
     """
-    Adds a new column to an existing SQLite table.
+    Upserts a page of tickets and their mapped field rows in one transaction.
 
     Args:
         db_path (str): Path to the SQLite database file.
-        table_name (str): Name of the table to modify.
-        column_name (str): Name of the new column.
-        column_type (str): SQLite data type (e.g., TEXT, INTEGER, REAL).
-        default_value (any): Optional default value for the column.
+        tickets (iterable): (key, (project, issuetype), field_rows, payload,
+            search_document, card_summary) tuples, later tuples win for a
+            repeated key. payload is the encode_payload() tuple of the raw
+            issue, search_document its build_search_document() row and
+            card_summary its build_card_summary() row, any may be None.
 
     Returns:
-        bool: True if successful, False if column already exists or error occurs.
+        dict: key -> ticket_id for every ticket in the page.
     """
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Check if column already exists
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        existing_columns = [col[1] for col in cursor.fetchall()]
-        if column_name in existing_columns:
-            print(f"Column '{column_name}' already exists in '{table_name}'.")
-            return False
-
-        # Build ALTER TABLE statement
-        alter_stmt = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
-        if default_value is not None:
-            alter_stmt += f" DEFAULT {repr(default_value)}"
-
-        cursor.execute(alter_stmt)
-        conn.commit()
-        print(f"Column '{column_name}' added to '{table_name}'.")
-        return True
-
-    except sqlite3.Error as e:
-        print(f"SQLite error: {e}")
-        return False
+    page = {}
+    payloads = {}
+    search_documents = {}
+    card_summaries = {}
+    for key, type_key, field_rows, payload, search_document, card_summary in tickets:
+        page[str(key)] = (tuple(type_key), field_rows)
+        if payload is not None:
+            payloads[str(key)] = payload
+        if search_document is not None:
+            search_documents[str(key)] = search_document
+        if card_summary is not None:
+            card_summaries[str(key)] = card_summary
+    definitions = {}
+    for type_key, field_rows in page.values():
+        for field in field_rows:
+            definitions[(*type_key, field["field_key"])] = field
+
+    stored_at = datetime.datetime.now().isoformat()
+    with transaction(db_path) as conn:
+        ticket_ids = upsert_ticket_keys(db_path, page)
+        def_ids = upsert_field_definitions(db_path, definitions)
+        # A ticket moved to another project or issuetype drops its old fields
+        conn.executemany(
+            """
+            DELETE FROM ticket_fields WHERE ticket_id = ? AND field_def_id IN (
+                SELECT field_def_id FROM field_definitions
+                WHERE project != ? OR issuetype != ?
+            );
+        """,
+            ((ticket_ids[key], *type_key) for key, (type_key, _) in page.items()),
+        )
+        conn.executemany(
+            """
+            INSERT INTO ticket_fields (ticket_id, field_def_id, current_value)
+            VALUES (?, ?, ?)
+            ON CONFLICT (ticket_id, field_def_id) DO UPDATE SET
+                current_value = excluded.current_value
+        """,
+            (
+                (ticket_ids[key], def_ids[(*type_key, field["field_key"])], field["current_value"])
+                for key, (type_key, field_rows) in page.items()
+                for field in field_rows
+            ),
+        )
+        # Unchanged issues keep their stored blob
+        conn.executemany(
+            """
+            INSERT INTO ticket_payloads (ticket_id, codec, content_hash, raw_size, payload, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (ticket_id) DO UPDATE SET
+                codec = excluded.codec,
+                content_hash = excluded.content_hash,
+                raw_size = excluded.raw_size,
+                payload = excluded.payload,
+                updated_at = excluded.updated_at
+            WHERE ticket_payloads.content_hash != excluded.content_hash
+        """,
+            (
+                (ticket_ids[key], *payload, stored_at)
+                for key, payload in payloads.items()
+            ),
+        )
+        # FTS5 has no upsert, REPLACE swaps the row with the same rowid
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO ticket_search (rowid, key, summary, description, field_text)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (
+                (ticket_ids[key], *search_document)
+                for key, search_document in search_documents.items()
+            ),
+        )
+        conn.executemany(
+            """
+            UPDATE tickets SET summary = ?, status = ?, assignee = ?, priority = ?, updated = ?
+            WHERE ticket_id = ?
+        """,
+            (
+                (*card_summary, ticket_ids[key])
+                for key, card_summary in card_summaries.items()
+            ),
+        )
+    return ticket_ids
 
-    finally:
-        conn.close()
 
+# ticket_counts row holding the number of tickets across all projects
+TOTAL_COUNT_KEY = "*"
 
-def add_or_find_key_return_id(db_path: str, key: str) -> int:
 
-    select = f"""
-        SELECT * FROM tickets WHERE key = '{key}';
+def get_ticket_count(db_path, project_key=None):
     """
-    print(f"{key=}")
-    items = run_sql_stmt(db_path, select, stmt_type="select")
-    print(f"{items=}")
-    if items != None:
-        if len(items) > 0:
-            print(f"Item {key} found in database.\nRecords = {items}")
-            ticket_id, key, needs_update = items[0]
-            return ticket_id
-        else:
-            # ADD MISSING KEY TO DATABASE
-            run_sql_stmt(
-                db_path,
-                sql="INSERT INTO tickets (key) VALUES (?)",
-                stmt_type="insert",
-                params=(key,)
-            )
-            items = run_sql_stmt(db_path, select, stmt_type="select")
-            if items and len(items) > 0:
-                print(f"Item created successfully!\nRecords = {items}")
-                ticket_id, key, needs_update = items[0]
-                return ticket_id
-            else:
-                print(f"Issue adding {key} to database")
-                return 0
-
+    Returns the number of stored tickets, in project_key if given, from the
+    trigger-maintained ticket_counts table.
+    """
+    rows = run_sql_stmt(
+        db_path,
+        "SELECT ticket_count FROM ticket_counts WHERE project_key = ?",
+        stmt_type="select",
+        params=(TOTAL_COUNT_KEY if project_key is None else project_key,),
+    )
+    return rows[0][0] if rows else 0
 
-def add_or_find_field_return_id(db_path: str, ticket_id: int, field: dict) -> int:
-    try:
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-
-            # Check if field exists for given ticket_id and field_key
-            cursor.execute(
-                """
-                SELECT id FROM fields
-                WHERE ticket_id = ? AND field_key = ?;
-            """,
-                (ticket_id, field["field_key"]),
-            )
 
-            result = cursor.fetchone()
-            if result:
-                print(
-                    f"Field {field['field_key']} already exists.\nRecord ID = {result[0]}"
-                )
-                return result[0]
-
-            # Insert new field
-            cursor.execute(
-                """
-                INSERT INTO fields (
-                    ticket_id,
-                    field_key,
-                    field_name,
-                    field_type,
-                    widget_type,
-                    is_editable,
-                    allowed_values,
-                    current_value
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    ticket_id,
-                    field["field_key"],
-                    field["field_name"],
-                    field["field_type"],
-                    field["widget_type"],
-                    field["is_editable"],
-                    field["allowed_values"],
-                    field["current_value"],
-                ),
-            )
+# Columns of tickets read for each card on the ticket board, see ticket_card_data
+TICKET_CARD_COLUMNS = "ticket_id, key, summary, status, assignee, priority, updated"
 
-            conn.commit()
-            return cursor.lastrowid
 
-    except Exception as e:
-        print(f"[SQL Error] {e}")
-        return 0
+def ticket_card_data(row):
+    """
+    Turns a TICKET_CARD_COLUMNS row into the ticket dict a TicketCard shows.
+    """
+    ticket_id, key, summary, status, assignee, priority, updated = row
+    return {
+        "id": ticket_id,
+        "key": key,
+        "summary": summary,
+        "status": status,
+        "assignee": assignee,
+        "priority": priority,
+        "updated": updated,
+    }
+
+
+def load_ticket_cards(db_path, ticket_ids):
+    """
+    Returns TICKET_CARD_COLUMNS rows for ticket_ids, in the order given.
+    """
+    ticket_ids = list(ticket_ids)
+    if not ticket_ids:
+        return []
+    rows = run_sql_stmt(
+        db_path,
+        f"SELECT {TICKET_CARD_COLUMNS} FROM tickets WHERE ticket_id IN ({', '.join('?' for _ in ticket_ids)})",
+        stmt_type="select",
+        params=tuple(ticket_ids),
+    )
+    by_id = {row[0]: row for row in rows or []}
+    return [by_id[ticket_id] for ticket_id in ticket_ids if ticket_id in by_id]
@@ -8,15 +8,33 @@ from jira_manager.custom_widgets import TicketCard, WorkReceiptsPanel
 from pprint import pprint
 from PIL import Image, ImageTk
 from jira_manager.file_manager import load_data
+from jira_manager.jira_client import get_client, build_url
+from jira_manager.metadata_cache import get_metadata_cache
+from jira_manager.checkpoints import SearchCheckpoint, get_incomplete_search_tasks
+from jira_manager.saved_queries import SavedQuery, last_results
+from jira_manager.db_writer import DatabaseWriter
+from jira_manager.payload_store import encode_payload
+from jira_manager.local_search import build_search_document, build_card_summary
+from jira_manager.local_jql import UnsupportedJQL, run_local_jql
+from jira_manager.jql_planner import (
+    plan_search_slices,
+    fetch_approximate_count,
+    plan_fetch_concurrency,
+    fetch_jira_timezone,
+    fetch_result_keys,
+    DEFAULT_SEARCH_WARN_LIMIT,
+    DEFAULT_SEARCH_MAX_RESULTS,
+)
 from jira_manager.sql_manager import (
     run_sql_stmt,
-    add_or_find_key_return_id,
-    add_or_find_field_return_id,
     batch_insert_tickets,
+    upsert_ticket_page,
+    get_ticket_count,
 )
 from requests.exceptions import RequestException
 from queue import Queue, Empty
-from threading import Thread, Lock
+from threading import Thread, Lock, Event
+from datetime import datetime
 from jira_manager.custom_panels import (
     switch_panel,
     ErrorMessageBuilder,
@@ -199,37 +217,42 @@ def process_to_database(
     headers,
     progress_queue,
     internal_bar=None,
-    db_lock=None,
+    db_writer=None,
+    proxies=None,
+    shared_metadata=None,
+    known_keys=None,
 ):
+    # known_keys is a set of stored keys shared by all workers of a search,
+    # checking the card_retainer list per issue does not scale
+    if known_keys is None:
+        known_keys = set(str(x.get("key", "")) for x in card_retainer)
     for issue in issues:
         key_val_raw = issue.get("key", "")
         print(f"DEBUG: key_val_raw={key_val_raw}, type={type(key_val_raw)}")
         key_val = str(key_val_raw)
-        check = {"key": key_val}
-        print(
-            f"DEBUG: check={check}, card_retainer_types={[type(x.get('key', '')) for x in card_retainer]}"
-        )
-        if check in card_retainer:
+        if key_val in known_keys:
             existing_issues.append(key_val)
-            print("HERE!!! " + str(key_val))
         else:
+            known_keys.add(key_val)
             added_issues.append(key_val)
             card_retainer.append({"key": key_val, "widget": None})
-            new_issues.append(issue)
-            # Ensure ticket is inserted into the database
-            if db_lock:
-                with db_lock:
-                    created_ticket_id = add_or_find_key_return_id(db_path, key_val)
-                    print(f"{created_ticket_id=}")
-                    run_database_updates_to_tickets_fields_values(
-                        db_path, server, headers, [issue]
-                    )
-            else:
-                created_ticket_id = add_or_find_key_return_id(db_path, key_val)
-                print(f"{created_ticket_id=}")
-                run_database_updates_to_tickets_fields_values(
-                    db_path, server, headers, [issue]
-                )
+            if new_issues is not None:
+                new_issues.append(issue)
+        # Existing tickets are upserted too so refreshes pick up changed fields
+        if db_writer is not None:
+            db_writer.write_ticket(
+                key_val,
+                get_issue_type_key(issue),
+                map_issue_for_db(issue, server, headers, proxies, shared_metadata),
+                # Prepared here so the writer thread only does SQL
+                encode_payload(issue),
+                build_search_document(issue),
+                build_card_summary(issue),
+            )
+        else:
+            run_database_updates_to_tickets_fields_values(
+                db_path, server, headers, [issue], proxies, shared_metadata
+            )
 
         # Signal progress to the main thread
         if progress_queue is not None:
@@ -261,6 +284,214 @@ def process_to_database(
     #         progress_queue.put(1)
 
 
+def iter_issue_pages(
+    config_data,
+    jql,
+    headers,
+    proxies,
+    stop_flag=None,
+    expand_editmeta=False,
+    start_token=None,
+    with_tokens=False,
+):
+    """
+    Follows nextPageToken on /search/jql and yields one list of issues per page,
+    or (issues, next_page_token) pairs when with_tokens is set.
+    """
+    base_url = build_url(config_data.get("server"), "rest/api/3/search/jql")
+    # Project and issuetype are needed to share editmeta between issues
+    body = {"jql": jql, "fields": ["*all"]}
+    if expand_editmeta:
+        body["expand"] = "editmeta"
+    if start_token:
+        body["nextPageToken"] = start_token
+    client = get_client()
+
+    while stop_flag is None or not stop_flag.is_set():
+        response = client.post(base_url, headers=headers, proxies=proxies, json=body)
+        if response.status_code != 200:
+            print(f"Error: {response.status_code} {response.text}")
+            # Raise instead of stopping so a throttled search is never
+            # mistaken for a complete one. raise_for_status() lets 204 and
+            # 3xx through, which have no page to read.
+            response.raise_for_status()
+            raise requests.exceptions.HTTPError(
+                f"Unexpected {response.status_code} from {base_url}", response=response
+            )
+
+        data = response.json()
+        next_page_token = data.get("nextPageToken")
+        if with_tokens:
+            yield data.get("issues", []), next_page_token
+        else:
+            yield data.get("issues", [])
+
+        if not next_page_token:
+            break
+        body["nextPageToken"] = next_page_token
+
+
+def run_search_pipeline(
+    config_data,
+    payload,
+    headers,
+    proxies,
+    db_path,
+    card_retainer,
+    existing_issues,
+    added_issues,
+    worker_count=1,
+    progress_queue=None,
+    stop_flag=None,
+    expand_editmeta=False,
+    shared_metadata=None,
+    queue_size=None,
+    slice_count=1,
+    checkpoint=None,
+    known_keys=None,
+    saved_query=None,
+):
+    """
+    Producer/consumer ingest: producer threads follow the search token chains
+    and put pages on a bounded queue while worker_count threads persist them.
+    With slice_count > 1 the JQL is split into disjoint created-date slices,
+    each fetched by its own producer. With a SearchCheckpoint, committed pages
+    are recorded and a resumed task continues each slice from its saved token.
+    With a SavedQuery, the highest `updated` value stored is tracked for the
+    next delta refresh. Returns the number of issues processed.
+    """
+    worker_count = max(1, int(worker_count))
+    server = config_data.get("server")
+    if checkpoint is not None and checkpoint.is_resumed():
+        work = checkpoint.pending_slices()
+    else:
+        slices = plan_search_slices(config_data, payload["jql"], headers, proxies, slice_count)
+        if checkpoint is not None:
+            checkpoint.set_slices(slices)
+        work = [(index, slice_jql, None, 0) for index, slice_jql in enumerate(slices)]
+    print(f"Search split into {len(work)} pending slice(s)")
+    # Bounded so memory stays flat when Jira is faster than SQLite
+    page_queue = Queue(maxsize=queue_size or worker_count * 2)
+    # All writes go through one thread that commits them in groups
+    db_writer = DatabaseWriter(db_path)
+    errors = []
+    processed = [0]
+    count_lock = Lock()
+    # Slices are disjoint, but keys are deduplicated in case an issue is
+    # edited across a window boundary while the search runs
+    seen_keys = set()
+    producers_left = [len(work)]
+
+    def fetch_slice(slice_index, jql, token, page_number):
+        for page, next_page_token in iter_issue_pages(
+            config_data,
+            jql,
+            headers,
+            proxies,
+            stop_flag,
+            expand_editmeta,
+            start_token=token,
+            with_tokens=True,
+        ):
+            # Stop downloading once any producer or consumer has failed,
+            # the search is reported as failed either way
+            if errors:
+                break
+            with count_lock:
+                page = [issue for issue in page if issue.get("key") not in seen_keys]
+                seen_keys.update(issue.get("key") for issue in page)
+            # Empty pages are still queued so the checkpoint can advance
+            page_queue.put((slice_index, page_number, next_page_token, page))
+            page_number += 1
+
+    def producer(slice_index, jql, token, page_number):
+        try:
+            try:
+                fetch_slice(slice_index, jql, token, page_number)
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if not token or status != 400:
+                    raise
+                print(f"Saved page token for slice {slice_index} was rejected, restarting slice.")
+                checkpoint.restart_slice(slice_index)
+                fetch_slice(slice_index, jql, None, 0)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            with count_lock:
+                producers_left[0] -= 1
+                last_producer = producers_left[0] == 0
+            if last_producer:
+                for _ in range(worker_count):
+                    page_queue.put(None)
+
+    def page_stored(slice_index, page_number, next_page_token, page):
+        # Runs on the writer thread once the page's tickets are committed
+        if saved_query is not None:
+            saved_query.observe(page)
+        if checkpoint is not None:
+            checkpoint.page_committed(slice_index, page_number, next_page_token)
+
+    def consumer():
+        while True:
+            item = page_queue.get()
+            if item is None:
+                break
+            # Keep draining after a failure so the producer never blocks forever
+            if errors:
+                continue
+            slice_index, page_number, next_page_token, page = item
+            try:
+                process_to_database(
+                    page,
+                    card_retainer,
+                    existing_issues,
+                    added_issues,
+                    None,
+                    db_path,
+                    server,
+                    headers,
+                    progress_queue,
+                    None,
+                    db_writer,
+                    proxies,
+                    shared_metadata,
+                    known_keys,
+                )
+                with count_lock:
+                    processed[0] += len(page)
+                # Bind this page's values, the loop reassigns them before the callback runs
+                db_writer.after_commit(
+                    lambda args=item: page_stored(*args)
+                )
+            except Exception as e:
+                errors.append(e)
+
+    if not work:
+        if checkpoint is not None:
+            checkpoint.complete()
+        return 0
+
+    threads = [Thread(target=producer, args=item, daemon=True) for item in work]
+    threads += [Thread(target=consumer, daemon=True) for _ in range(worker_count)]
+    db_writer.start()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        db_writer.close()
+    print(f"DB writer stats: {db_writer.stats}")
+
+    if errors:
+        raise errors[0]
+    # A stopped search keeps its checkpoint so the next run can resume it
+    if checkpoint is not None and (stop_flag is None or not stop_flag.is_set()):
+        checkpoint.complete()
+    return processed[0]
+
+
 def jql_search_handler(
     stop_flag,
     task,
@@ -287,6 +518,9 @@ def jql_search_handler(
             thread_count = int(task.get("thread_count", 1))
             print(f"thread_count={thread_count}")
             server = config_data.get("server")
+            # "shared" fetches editmeta once per (project, issuetype),
+            # "expand" has the search itself return editmeta per issue
+            editmeta_mode = config_data.get("editmeta_mode", "shared")
 
             # --- Sync card_retainer with DB tickets to prevent UI duplication ---
             db_tickets = run_sql_stmt(
@@ -332,91 +566,129 @@ def jql_search_handler(
             try:
                 added_issues = []
                 existing_issues = []
-                # Show and set up progress bar in indeterminate mode while fetching
+
+                # Re-running a saved query only fetches issues updated since
+                # its watermark, unless delta_sync is turned off in the config
+                saved_query = SavedQuery.open(db_path, server, payload["jql"])
+                search_payload = dict(payload)
+                if config_data.get("delta_sync", True) and saved_query.watermark is not None:
+                    jira_timezone = fetch_jira_timezone(config_data, headers, proxies)
+                    search_payload["jql"] = saved_query.delta_jql(jira_timezone)
+                print(f"search jql={search_payload['jql']}")
+
+                # Pre-flight: size the progress bar and fetch concurrency,
+                # and stop runaway queries before they flood the local DB
+                approximate_count = fetch_approximate_count(
+                    config_data, search_payload["jql"], headers, proxies
+                )
+                print(f"approximate_count={approximate_count}")
+                max_results = int(config_data.get("search_max_results", DEFAULT_SEARCH_MAX_RESULTS))
+                warn_limit = int(config_data.get("search_warn_limit", DEFAULT_SEARCH_WARN_LIMIT))
+                if approximate_count is not None and approximate_count > max_results:
+                    run_error(
+                        panel_choice,
+                        ui_state,
+                        widget_registry,
+                        f"This search matches about {approximate_count} tickets, more than the limit of {max_results}.\nPlease narrow the JQL query.",
+                    )
+                    return
+                if approximate_count is not None and approximate_count > warn_limit:
+                    print(f"WARNING: Large search of about {approximate_count} tickets queued.")
+                slice_count, worker_count = plan_fetch_concurrency(approximate_count, thread_count)
+
                 if show_internal_loadbar is not None:
                     try:
                         show_internal_loadbar()
                     except Exception as e:
                         print(f"Failed to show internal loadbar: {e}")
+                progress_queue = None
                 if internal_bar is not None:
                     try:
-                        internal_bar.config(mode='indeterminate')
-                        internal_bar.start()
-                        internal_bar.update_idletasks()
-                    except Exception as e:
-                        print(f"Failed to start indeterminate internal loadbar: {e}")
-
-                # Fetch all issues (unknown total)
-                issues = fetch_all_issues_threaded(
-                    config_data, payload, headers, proxies, thread_count
-                )
-                print(f"len(issues)={len(issues)}")
-
-                # Switch to determinate mode for processing
-                if internal_bar is not None:
-                    try:
-                        internal_bar.stop()
-                        internal_bar.config(mode='determinate', maximum=max(1, len(issues)), value=0)
+                        if approximate_count:
+                            internal_bar.config(mode="determinate", maximum=approximate_count, value=0)
+                            progress_queue = queue.Queue()
+                        else:
+                            # Unknown total, fall back to an indeterminate bar
+                            internal_bar.config(mode="indeterminate")
+                            internal_bar.start()
                         internal_bar.update_idletasks()
                     except Exception as e:
-                        print(f"Failed to switch to determinate internal loadbar: {e}")
-
-                # Remove duplicates using card_retainer
-                new_issues = []
-                progress_queue = queue.Queue()
-                db_lock = Lock()
-                batched_issues = batch_list(issues, thread_count)
-                threads = []
-                for batch in batched_issues:
-                    thread = Thread(
-                        target=process_to_database,
-                        args=(
-                            batch,
-                            card_retainer,
-                            existing_issues,
-                            added_issues,
-                            new_issues,
-                            db_path,
-                            server,
-                            headers,
-                            progress_queue,
-                            internal_bar,
-                            db_lock,
-                        ),
-                    )
-                    threads.append(thread)
-                    thread.start()
-
-                for thread in threads:
-                    thread.join()
-                # batched_issues = batch_list(issues, thread_count)
-                # threads = []
-                # for batch in batched_issues:
-                #     thread = Thread(target=process_to_database, args=(batch, card_retainer, existing_issues, added_issues, new_issues, db_path, server, headers, progress_queue, internal_bar))
-                #     threads.append(thread)
-                #     thread.start()
+                        print(f"Failed to set up internal loadbar: {e}")
 
-                # for thread in threads:
-                #     thread.join()
+                pipeline_done = Event()
 
                 def poll_progress():
                     try:
                         while True:
                             progress_queue.get_nowait()
-                            if internal_bar is not None:
+                            # The count is approximate, never overshoot the bar
+                            if internal_bar["value"] < internal_bar["maximum"]:
                                 internal_bar["value"] += 1
-                                internal_bar.update_idletasks()
                     except queue.Empty:
                         pass
-                    if any(t.is_alive() for t in threads):
-                        if internal_bar is not None:
-                            internal_bar.after(100, poll_progress)
+                    internal_bar.update_idletasks()
+                    if not pipeline_done.is_set():
+                        internal_bar.after(100, poll_progress)
 
-                if internal_bar is not None:
+                if progress_queue is not None:
                     internal_bar.after(100, poll_progress)
 
-                for t in threads:
-                    t.join()
+                # Pages are persisted while later pages are still downloading
+                metadata_cache = get_metadata_cache(db_path)
+                shared_metadata = new_shared_metadata(metadata_cache)
+                checkpoint = SearchCheckpoint.open(db_path, server, payload["jql"])
+                # A resumed run only observes the pages fetched from here on,
+                # so only a fresh, non-delta run knows the whole result set
+                full_run = search_payload["jql"] == payload["jql"] and not checkpoint.is_resumed()
+                # Reuses the keys read for the card_retainer sync above,
+                # nothing has written tickets since
+                known_keys = set(db_ticket_keys)
+                known_keys.update(str(x.get("key", "")) for x in card_retainer or [])
+                try:
+                    processed = run_search_pipeline(
+                        config_data,
+                        search_payload,
+                        headers,
+                        proxies,
+                        db_path,
+                        card_retainer,
+                        existing_issues,
+                        added_issues,
+                        worker_count=worker_count,
+                        progress_queue=progress_queue,
+                        stop_flag=stop_flag,
+                        slice_count=slice_count,
+                        expand_editmeta=editmeta_mode == "expand",
+                        shared_metadata=shared_metadata,
+                        checkpoint=checkpoint,
+                        known_keys=known_keys,
+                        saved_query=saved_query,
+                    )
+                finally:
+                    pipeline_done.set()
+                if not stop_flag.is_set():
+                    result_keys = None
+                    if not full_run and config_data.get("local_jql", True):
+                        # A delta run can't see tickets that stopped matching,
+                        # a keys-only pass keeps the local JQL results current
+                        try:
+                            result_keys = fetch_result_keys(config_data, payload["jql"], headers, proxies)
+                        except (requests.exceptions.RequestException, ValueError) as e:
+                            print(f"Result keys unavailable: {e}")
+                    saved_query.commit(full_run, result_keys)
+                print(f"processed issues={processed}")
+                if internal_bar is not None:
+                    try:
+                        internal_bar.stop()
+                        internal_bar.config(mode="determinate", maximum=max(1, processed), value=processed)
+                        internal_bar.update_idletasks()
+                    except Exception as e:
+                        print(f"Failed to complete internal loadbar: {e}")
+                print(f"Jira client stats: {get_client().get_stats()}")
+                print(f"Editmeta cache stats: {metadata_cache.get_stats()}")
+                # The pipeline is done, so the LRU times can be written without
+                # competing with the DatabaseWriter
+                metadata_cache.flush()
 
                 # Create the receipt in the database
                 import os
@@ -582,6 +854,22 @@ def jql_search_handler(
     print("Thread shutting down.")
 
 
+def resume_incomplete_searches(db_path, queue_search):
+    """
+    Re-queues searches that were interrupted by a crash or shutdown, so they
+    continue from their checkpoints. queue_search(jql) queues one search.
+    """
+    server = load_data().get("server")
+    for task in get_incomplete_search_tasks(db_path):
+        if task["server"] != server:
+            continue
+        print(f"Re-queueing interrupted search: {task['jql']}")
+        try:
+            queue_search(task["jql"])
+        except Exception as e:
+            print(f"Failed to resume search {task['task_id']}: {e}")
+
+
 def update_ticket_bucket(
     ticket_bucket_items, panel_choice, theme_manager, db_path, selected_items
 ):
@@ -629,17 +917,80 @@ def update_ticket_bucket_with_single(
 
 
 def run_database_updates_to_tickets_fields_values(
-    db_path, server, headers, jira_tickets
+    db_path, server, headers, jira_tickets, proxies=None, shared_metadata=None
 ):
     print("Running database update")
-    for ticket in jira_tickets:
-        key = ticket["key"]
-        ticket_id = add_or_find_key_return_id(db_path, key)
-        editable_fields = get_editable_fields_v2(key, server, headers)
-        mapped_fields = map_fields_for_db(editable_fields, ticket)
-        for field in mapped_fields:
-            fields_id = add_or_find_field_return_id(db_path, ticket_id, field)
-            print(f"{fields_id=}")
+    # Editmeta is fetched first so the write transaction stays short
+    mapped_tickets = [
+        (
+            ticket["key"],
+            get_issue_type_key(ticket),
+            map_issue_for_db(ticket, server, headers, proxies, shared_metadata),
+            encode_payload(ticket),
+            build_search_document(ticket),
+            build_card_summary(ticket),
+        )
+        for ticket in jira_tickets
+    ]
+    ticket_ids = upsert_ticket_page(db_path, mapped_tickets)
+    print(f"{ticket_ids=}")
+
+
+def map_issue_for_db(issue, server, headers, proxies=None, shared_metadata=None):
+    # Network-side half of an ingest: editmeta lookup and field mapping
+    if shared_metadata is not None:
+        editable_fields = get_shared_editable_fields(
+            issue, server, headers, shared_metadata, proxies
+        )
+    else:
+        editable_fields = get_editable_fields_v2(issue["key"], server, headers, proxies)
+    return map_fields_for_db(editable_fields, issue)
+
+
+def new_shared_metadata(cache=None):
+    # cache is an optional persistent MetadataCache consulted before Jira
+    return {"lock": Lock(), "type_locks": {}, "fields": {}, "cache": cache}
+
+
+def get_issue_type_key(issue):
+    fields = issue.get("fields") or {}
+    project = (fields.get("project") or {}).get("key") or str(issue.get("key", "")).split("-")[0]
+    issuetype = (fields.get("issuetype") or {}).get("id", "")
+    return (project, issuetype)
+
+
+def get_shared_editable_fields(issue, server, headers, shared_metadata, proxies=None):
+    """
+    Returns editmeta fields for an issue, downloading them at most once per
+    (project, issuetype) for the lifetime of shared_metadata.
+    """
+    # Searches run with expand=editmeta already carry it on the issue
+    editmeta = issue.get("editmeta")
+    if editmeta is not None:
+        return editmeta.get("fields", {})
+
+    type_key = get_issue_type_key(issue)
+    with shared_metadata["lock"]:
+        if type_key in shared_metadata["fields"]:
+            return shared_metadata["fields"][type_key]
+        type_lock = shared_metadata["type_locks"].setdefault(type_key, Lock())
+
+    # Only one thread fetches a given type, the others wait for its result
+    with type_lock:
+        with shared_metadata["lock"]:
+            if type_key in shared_metadata["fields"]:
+                return shared_metadata["fields"][type_key]
+        cache = shared_metadata.get("cache")
+        editable_fields = None
+        if cache is not None:
+            editable_fields = cache.get(server, *type_key)
+        if editable_fields is None:
+            editable_fields = get_editable_fields_v2(issue["key"], server, headers, proxies)
+            if cache is not None:
+                cache.put(server, *type_key, editable_fields)
+        with shared_metadata["lock"]:
+            shared_metadata["fields"][type_key] = editable_fields
+        return editable_fields
 
 
 def map_fields_for_db(editable_fields, current_issue_fields=None):
@@ -698,10 +1049,10 @@ def map_fields_for_db(editable_fields, current_issue_fields=None):
     return field_rows
 
 
-def get_editable_fields_v2(issue_key, base_url, headers):
-    url = f"{base_url}/rest/api/3/issue/{issue_key}/editmeta"
+def get_editable_fields_v2(issue_key, base_url, headers, proxies=None):
+    url = build_url(base_url, f"rest/api/3/issue/{issue_key}/editmeta")
 
-    response = requests.get(url, headers=headers)
+    response = get_client().get(url, headers=headers, proxies=proxies)
     response.raise_for_status()
     return response.json().get("fields", {})
 
@@ -814,30 +1165,19 @@ def create_toolbar(parent, bg="#4C30EB", padding=10):
 
 
 def fetch_all_issues_threaded(
-    config_data, payload, headers, proxies, thread_count=1, return_queue: Queue = None
+    config_data,
+    payload,
+    headers,
+    proxies,
+    thread_count=1,
+    return_queue: Queue = None,
+    expand_editmeta=False,
 ):
-    base_url = f"{config_data.get('server')}rest/api/3/search/jql"
-    jql = payload["jql"]
-    data = {"jql": jql, "fields": ["key", "fields"]}
     all_issues = []
-    next_page_token = None
-
-    while True:
-        if next_page_token:
-            payload["nextPageToken"] = next_page_token
-
-        response = requests.post(base_url, headers=headers, json=data)
-        if response.status_code != 200:
-            print(f"Error: {response.status_code} {response.text}")
-            break
-
-        data = response.json()
-        issues = data.get("issues", [])
+    for issues in iter_issue_pages(
+        config_data, payload["jql"], headers, proxies, expand_editmeta=expand_editmeta
+    ):
         all_issues.extend(issues)
-
-        next_page_token = data.get("nextPageToken")
-        if not next_page_token:
-            break
     return all_issues
 
     # max_results = 100
@@ -1009,6 +1349,34 @@ def configure_project_credentials(
     return (headers, proxies)
 
 
+def run_jql_locally(config_data, jql, db_path, headers=None, proxies=None):
+    """
+    Returns the (ticket_id, key) rows for jql from the local database, or
+    None when it has to go to Jira. Only queries whose results were
+    recorded from this server within local_jql_max_age_minutes, by a full
+    run or a reconciled delta run, are answered locally and only from the
+    tickets recorded.
+    """
+    if not config_data.get("local_jql", True):
+        return None
+    results = last_results(db_path, config_data.get("server"), jql)
+    if results is None:
+        return None
+    query_id, results_at = results
+    max_age = float(config_data.get("local_jql_max_age_minutes", 15))
+    if (datetime.now() - results_at).total_seconds() > max_age * 60:
+        return None
+    # Absolute dates in jql are in the user's Jira timezone, cached per server
+    jira_timezone = fetch_jira_timezone(config_data, headers, proxies)
+    try:
+        rows = run_local_jql(db_path, jql, query_id, jira_timezone)
+    except UnsupportedJQL as e:
+        print(f"Running JQL on Jira: {e}")
+        return None
+    print(f"Answered JQL locally with {len(rows)} tickets.")
+    return rows
+
+
 def toolbar_action(
     payload,
     ui_state,
@@ -1060,6 +1428,22 @@ def toolbar_action(
         if payload["jql"] == "Enter proper JQL query":
             run_error(panel_choice, ui_state, widget_registry, "Missing JQL Statement.")
             return
+        local_rows = run_jql_locally(config_data, payload["jql"], db_path, headers, proxies)
+        if local_rows is not None:
+            switch_panel(
+                "ticket_panel",
+                ui_state,
+                panel_choice,
+                widget_registry,
+                db_path,
+                theme_manager,
+                card_retainer,
+                selected_items,
+            )
+            panel_choice["ticket_panel"].show_local_results(local_rows, payload["jql"])
+            if jql_query:
+                jql_query.delete(0, "end")
+            return
         try:
             print("Queueing JQL search task...")
             task = {
@@ -1113,8 +1497,7 @@ def toolbar_action(
 
     # LOGIC FOR TICKETS PANEL
     elif payload["type"] == "tickets":
-        tickets = run_sql_stmt(db_path, "SELECT * FROM tickets", stmt_type="select")
-        if not tickets:
+        if not get_ticket_count(db_path):
             panel_choice["error_panel"].update_message(
                 "No tickets stored in local database.\nPlease configure your Jira connection and fetch tickets."
             )
@@ -1139,15 +1522,8 @@ def toolbar_action(
                 selected_items,
             )
         else:
-            # Sort card_retainer by integer part after dash, DESC
-            def ticket_key_int(ticket):
-                key = ticket.get("key", "")
-                try:
-                    return int(key.split("-")[-1])
-                except Exception:
-                    return 0
-
-            card_retainer.sort(key=ticket_key_int, reverse=True)
+            # The board is read from the database in order, card_retainer
+            # is only looked up by key so it doesn't need sorting here
             switch_panel(
                 "ticket_panel",
                 ui_state,